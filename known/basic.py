@@ -3,15 +3,25 @@ __doc__=r"""
 :py:mod:`known/basic.py`
 """
 #=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
-__all__ = [ 'HRsizes', 'EveryThing', 'Kio', 'Verbose', 'Remap',  'BaseConvert', 'IndexedDict', 'Zipper', 'Mailer' ]
+__all__ = [ 'HRsizes', 'EveryThing', 'Kio', 'KioCache', 'KioSaver', 'JsonlWriter', 'KioStore', 'KioColumns', 'KioShm', 'KioLog', 'Verbose', 'UidGen', 'Remap',  'BaseConvert', 'BaseCodec', 'IndexedDict', 'SparseIndexedDict', 'ArrayIndexedDict', 'CompactIndexedDict', 'Zipper', 'Mailer' ]
 #=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
 from typing import Any, Union, Iterable, Callable #, BinaryIO, cast, Dict, Optional, Type, Tuple, IO
-import os, platform, datetime, smtplib, mimetypes, json, pickle
-from math import floor, log, ceil
+import os, platform, datetime, smtplib, mimetypes, json, pickle, gzip, bz2, lzma, zlib, random, operator, numbers
+from time import perf_counter_ns, time_ns, localtime, strftime
+from itertools import count, islice
+from weakref import WeakSet
+from sys import getsizeof
+from math import log, ceil, gcd
 from zipfile import ZipFile
 from email.message import EmailMessage
-from collections import UserDict
-from io import BytesIO
+from collections import UserDict, OrderedDict, deque
+from collections.abc import MutableMapping
+from copy import deepcopy
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from io import BytesIO, RawIOBase, BufferedReader, BufferedWriter, TextIOWrapper
+from contextlib import contextmanager
+from multiprocessing.shared_memory import SharedMemory
 
 
 #=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
@@ -35,41 +45,1110 @@ class EveryThing: # use as a set that contains everything (use with 'in' keyword
 
 #=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
 
+class _ZlibFile(RawIOBase):
+    r""" minimal streaming file object for raw zlib streams - use with :func:`~known.basic.Kio.open_stream` """
+    CHUNK = 2**16
+
+    def __init__(self, f, mode:str='rb', level:int=-1) -> None:
+        super().__init__()
+        self.owned = isinstance(f, (str, os.PathLike))
+        self.f = open(f, mode) if self.owned else f
+        self.writing = mode.startswith('w') or mode.startswith('a')
+        self.z = zlib.compressobj(level) if self.writing else zlib.decompressobj()
+
+    def readable(self): return not self.writing
+    def writable(self): return self.writing
+
+    def write(self, b):
+        self.f.write(self.z.compress(b))
+        return memoryview(b).nbytes
+
+    def readinto(self, b):
+        while True:
+            data = self.z.unconsumed_tail
+            if not data:
+                if self.z.eof: # concatenated streams (like appended files)
+                    data = self.z.unused_data or self.f.read(self.CHUNK)
+                    if not data: return 0
+                    self.z = zlib.decompressobj()
+                else:
+                    data = self.f.read(self.CHUNK)
+                    if not data: raise EOFError('Compressed file ended before the end-of-stream marker was reached')
+            out = self.z.decompress(data, len(b))
+            if out: 
+                b[:len(out)] = out
+                return len(out)
+
+    def close(self):
+        if self.closed: return
+        try:
+            if self.writing: self.f.write(self.z.flush())
+        finally:
+            if self.owned: self.f.close()
+            super().close()
+
+#=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class _jsonl:
+    r""" dump/load for JSON Lines (one json record per line) - used as ``ioas='jsonl'`` in :class:`~known.basic.Kio` """
+
+    @staticmethod
+    def dump(o:Iterable, f, **kwargs) -> None:
+        for r in o: f.write(json.dumps(r, **kwargs) + '\n')
+
+    @staticmethod
+    def load(f, **kwargs) -> list: return list(__class__.iter(f, **kwargs))
+
+    @staticmethod
+    def iter(f, skip:int=0, limit:Union[None, int]=None, **kwargs):
+        # skipped lines are not parsed
+        if limit is not None and limit<=0: return
+        for line in f:
+            if not line.strip(): continue
+            if skip>0: 
+                skip-=1
+                continue
+            yield json.loads(line, **kwargs)
+            if limit is not None:
+                limit-=1
+                if limit<=0: break
+
+#=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
 class Kio:
-    r""" provides input/out methods for loading saving python objects using json and pickle """
-    IOAS = dict(json=json, pickle=pickle)
-    IOFLAG = dict(json='', pickle='b')
+    r""" provides input/out methods for loading saving python objects using json and pickle 
+    
+    .. note:: ndarrays can be saved using ``ioas='npy'`` and loaded back either fully (``'npy'``) 
+        or lazily as a ``numpy.memmap`` (``'mmap'``) that maps the file into memory without reading it.
+        These modes can not be compressed - a codec (given or inferred from extension) raises an ``AssertionError``.
+    """
+    IOAS = dict(json=json, pickle=pickle, jsonl=_jsonl)
+    IOFLAG = dict(json='t', pickle='b', jsonl='t')
+    NPYAS = dict(npy=None, mmap='r') # default mmap_mode for each numpy mode
+
+    CODECS = dict(
+        gzip =  lambda f, mode, level: gzip.open(f, mode, **({} if level is None else dict(compresslevel=level))),
+        bz2 =   lambda f, mode, level: bz2.open(f, mode, **({} if level is None else dict(compresslevel=level))),
+        lzma =  lambda f, mode, level: lzma.open(f, mode, **({} if level is None else dict(preset=level))),
+        zlib =  lambda f, mode, level: __class__._zlib_open(f, mode, level),
+    )
+    r""" Compression codecs (from stdlib) - each maps to an opener ``(f, mode, level) -> file-object`` """
+    CODEC_EXT = { '.gz':'gzip', '.gzip':'gzip', '.bz2':'bz2', '.xz':'lzma', '.lzma':'lzma', '.zz':'zlib', '.zlib':'zlib' }
+    r""" File extensions used to infer codec from path """
 
     @staticmethod
-    def save_buffer(o:Any, ioas:str, seek0=False, **kwargs) -> None:
+    def _zlib_open(f, mode, level):
+        raw = _ZlibFile(f, mode.replace('t', '').replace('b', '') + 'b', -1 if level is None else level)
+        s = BufferedWriter(raw) if raw.writing else BufferedReader(raw)
+        return TextIOWrapper(s) if 't' in mode else s
+
+    @staticmethod
+    def codec_of(path:str) -> Union[None, str]:
+        r""" infers codec from extension of ``path``, returns `None` if not a compressed extension """
+        return __class__.CODEC_EXT.get(os.path.splitext(f'{path}')[-1].lower(), None)
+
+    @staticmethod
+    @contextmanager
+    def open_stream(f, mode:str, codec:Union[None, str]=None, level:Union[None, int]=None):
+        r""" Context manager that opens a path or a binary file-object for streaming through an optional codec
+
+        :param f:       a path or a binary file-object (like ``BytesIO``), file-objects are not closed on exit
+        :param mode:    one of ``'rb', 'wb', 'rt', 'wt'``
+        :param codec:   a key in :data:`~known.basic.Kio.CODECS` or `None` for no compression
+        :param level:   compression level for the codec, if `None`, uses the codec's default
+
+        .. note:: data is compressed (or decompressed) in chunks as it is written (or read), 
+            the uncompressed payload is never built in memory.
+        """
+        is_path = isinstance(f, (str, os.PathLike))
+        if codec:
+            opener = __class__.CODECS.get(f'{codec}', None)
+            assert opener is not None, f'codec error {codec}'
+            s = opener(f, mode, level)
+        elif is_path:   s = open(f, mode)
+        elif 't' in mode: s = TextIOWrapper(f)
+        else:           s = f
+        try: yield s
+        finally:
+            if s is f: pass
+            elif codec or is_path: s.close()
+            else: s.detach() # do not close the underlying file-object
+
+    @staticmethod
+    def save_buffer(o:Any, ioas:str, seek0=False, codec:Union[None, str]=None, level:Union[None, int]=None, **kwargs) -> None:
         d = __class__.IOAS.get(f'{ioas}', None)
         assert d is not None, f'key error {ioas}'
         buffer = BytesIO()
-        d.dump(o, buffer)
+        with __class__.open_stream(buffer, f'w{__class__.IOFLAG[ioas]}', codec, level) as f: d.dump(o, f, **kwargs)
         if seek0: buffer.seek(0) # prepares for reading
         return buffer
 
     @staticmethod
-    def load_buffer(buffer:BytesIO, ioas:str, seek0=True): 
+    def load_buffer(buffer:BytesIO, ioas:str, seek0=True, codec:Union[None, str]=None): 
         d = __class__.IOAS.get(f'{ioas}', None)
         assert d is not None, f'key error {ioas}'
         if seek0: buffer.seek(0) # prepares for reading
-        return d.load(buffer)
+        with __class__.open_stream(buffer, f'r{__class__.IOFLAG[ioas]}', codec) as f: o = d.load(f)
+        return o
+
+    OOB_MIN_SIZE = 2**16
+    r""" Minimum size (bytes) of a buffer to be kept out-of-band by :func:`~known.basic.Kio.save_buffer_oob` """
+
+    @staticmethod
+    def save_buffer_oob(o:Any, seek0=False, min_size:Union[None, int]=None) -> tuple:
+        r""" pickles using protocol 5 and keeps large contiguous buffers out-of-band - they are not copied into the pickle stream
+
+        Only objects that pickle their data as ``pickle.PickleBuffer`` (like NumPy ndarrays) are kept out-of-band, 
+        others (like ``bytes``, ``bytearray`` and torch tensors) are pickled in-band as usual.
+
+        :param min_size:    buffers smaller than this (bytes) are pickled in-band, if `None`, uses :data:`~known.basic.Kio.OOB_MIN_SIZE`
+
+        :returns:           2-tuple ``(buffer, buffers)`` - a ``BytesIO`` with the pickle stream and a list of ``memoryview`` on the out-of-band data
+
+        .. note:: the memoryviews point to the memory of the original object, changing the object before loading will change the loaded object as well
+
+        .. seealso::
+            :func:`~known.basic.Kio.load_buffer_oob`
+        """
+        if min_size is None: min_size = __class__.OOB_MIN_SIZE
+        buffers = []
+        def callback(pb:pickle.PickleBuffer):
+            try: m = pb.raw()
+            except BufferError: return True # non-contiguous, keep in-band
+            if m.nbytes < min_size: return True
+            buffers.append(m)
+            return False # false value means out-of-band
+        buffer = BytesIO()
+        pickle.dump(o, buffer, protocol=5, buffer_callback=callback)
+        if seek0: buffer.seek(0) # prepares for reading
+        return buffer, buffers
 
     @staticmethod
-    def save_file(o:Any, path:str, ioas:str, **kwargs) -> None:
+    def load_buffer_oob(buffer:BytesIO, buffers:Iterable, seek0=True):
+        r""" loads a pickle stream created by :func:`~known.basic.Kio.save_buffer_oob`, objects are rebuilt over ``buffers`` without copying
+
+        .. note:: objects loaded over read-only buffers (like ``bytes``) will be read-only
+        """
+        if seek0: buffer.seek(0) # prepares for reading
+        return pickle.load(buffer, buffers=buffers)
+
+    @staticmethod
+    def save_file(o:Any, path:str, ioas:str, codec:Union[None, str]=None, level:Union[None, int]=None, **kwargs) -> None:
+        r""" saves an object to file, if ``codec`` is `None`, it is inferred from extension of ``path`` (see :data:`~known.basic.Kio.CODEC_EXT`) """
+        if f'{ioas}' in __class__.NPYAS: 
+            assert not (codec or level is not None or __class__.codec_of(path)), f'{ioas} files can not be compressed, got codec {codec or __class__.codec_of(path)} for {path}'
+            return __class__.save_npy(o, path)
         d = __class__.IOAS.get(f'{ioas}', None)
         assert d is not None, f'key error {ioas}'
-        with open(path, f'w{__class__.IOFLAG[d]}') as f: d.dump(o, f, **kwargs)
+        if codec is None: codec = __class__.codec_of(path)
+        with __class__.open_stream(path, f'w{__class__.IOFLAG[ioas]}', codec, level) as f: d.dump(o, f, **kwargs)
         return path
 
     @staticmethod
-    def load_file(path:str, ioas:str):
+    def load_file(path:str, ioas:str, codec:Union[None, str]=None, **kwargs):
+        r""" loads an object from file, if ``codec`` is `None`, it is inferred from extension of ``path`` (see :data:`~known.basic.Kio.CODEC_EXT`) """
+        if f'{ioas}' in __class__.NPYAS: 
+            assert not (codec or __class__.codec_of(path)), f'{ioas} files can not be compressed, got codec {codec or __class__.codec_of(path)} for {path}'
+            return __class__.load_npy(path, **{'mmap_mode':__class__.NPYAS[ioas], **kwargs})
         d = __class__.IOAS.get(f'{ioas}', None)
         assert d is not None, f'key error {ioas}'
-        with open(path, f'r{__class__.IOFLAG[d]}') as f: o = d.load(f)
+        if codec is None: codec = __class__.codec_of(path)
+        with __class__.open_stream(path, f'r{__class__.IOFLAG[ioas]}', codec) as f: o = d.load(f, **kwargs)
         return o
 
+    @staticmethod
+    def iter_jsonl(path:str, skip:int=0, limit:Union[None, int]=None, batch:Union[None, int]=None, codec:Union[None, str]=None, **kwargs):
+        r""" Generator over records of a JSON Lines file, reads one line at a time (constant memory)
+
+        :param skip:    number of records to skip from the start, skipped records are not parsed
+        :param limit:   maximum number of records to yield, if `None`, yields all
+        :param batch:   if provided, yields lists of (upto) ``batch`` records instead of single records
+        :param codec:   if `None`, it is inferred from extension of ``path``
+
+        .. seealso::
+            :class:`~known.basic.JsonlWriter`
+        """
+        if codec is None: codec = __class__.codec_of(path)
+        with __class__.open_stream(path, 'rt', codec) as f:
+            records = _jsonl.iter(f, skip=skip, limit=limit, **kwargs)
+            if not batch: yield from records
+            else:
+                b = []
+                for r in records:
+                    b.append(r)
+                    if len(b)>=batch: 
+                        yield b
+                        b = []
+                if b: yield b
+
+    @staticmethod
+    def save_file_atomic(o:Any, path:str, ioas:str, **kwargs) -> str:
+        r""" same as :func:`~known.basic.Kio.save_file` but writes to a temporary file first and then renames it to ``path``,
+        readers will either see the old file or the new file but never a partially written one """
+        if 'codec' not in kwargs: kwargs['codec'] = __class__.codec_of(path)
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp' # same folder, so that rename is atomic
+        try:
+            __class__.save_file(o, tmp, ioas, **kwargs)
+            os.replace(tmp, path)
+        except:
+            if os.path.exists(tmp): os.remove(tmp)
+            raise
+        return path
+
+    @staticmethod
+    def _try_(fn:Callable, *args, **kwargs) -> tuple:
+        # calls fn and returns 2-tuple (result, error) instead of raising - used by bulk methods
+        try: return fn(*args, **kwargs), None
+        except Exception as e: return None, e
+
+    @staticmethod
+    def _imap_(fn:Callable, items:Iterable, workers:Union[None, int], use_process:bool, ordered:bool, **kwargs):
+        # runs fn(*item, **kwargs) for each item on a pool and yields 3-tuples (index, result, error)
+        # only a window of items are in flight at a time so that large iterables are not consumed upfront
+        workers = workers if workers else (os.cpu_count() or 1)
+        window = 4*workers
+        with (ProcessPoolExecutor if use_process else ThreadPoolExecutor)(max_workers=workers) as executor:
+            if ordered:
+                inflight = deque()
+                for i,item in enumerate(items):
+                    inflight.append((i, executor.submit(__class__._try_, fn, *item, **kwargs)))
+                    if len(inflight)>=window:
+                        j, future = inflight.popleft()
+                        yield (j, *future.result())
+                while inflight:
+                    j, future = inflight.popleft()
+                    yield (j, *future.result())
+            else:
+                inflight = {}
+                for i,item in enumerate(items):
+                    inflight[executor.submit(__class__._try_, fn, *item, **kwargs)] = i
+                    if len(inflight)>=window:
+                        done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                        for future in done: yield (inflight.pop(future), *future.result())
+                while inflight:
+                    done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                    for future in done: yield (inflight.pop(future), *future.result())
+
+    @staticmethod
+    def imap_load(paths:Iterable[str], ioas:str, workers:Union[None, int]=None, use_process:bool=False, ordered:bool=True, **kwargs):
+        r""" Generator that loads files on a pool and yields 3-tuples ``(index, object, error)`` as they finish
+
+        :param paths:       iterable of paths, consumed lazily
+        :param workers:     pool width, if `None`, uses ``os.cpu_count()``
+        :param use_process: if `True`, uses a process pool (for cpu-bound parsing) instead of a thread pool
+        :param ordered:     if `True`, yields in input order, otherwise in order of completion
+        :param kwargs:      passed to :func:`~known.basic.Kio.load_file`
+
+        .. note:: ``error`` is the exception raised while loading (``object`` is `None` then) or `None` on success, a failed item does not abort the batch
+        """
+        yield from __class__._imap_(__class__.load_file, ((path, ioas) for path in paths), workers, use_process, ordered, **kwargs)
+
+    @staticmethod
+    def imap_save(pairs:Iterable[tuple], ioas:str, workers:Union[None, int]=None, use_process:bool=False, ordered:bool=True, **kwargs):
+        r""" Generator that saves ``(object, path)`` pairs on a pool and yields 3-tuples ``(index, path, error)`` as they finish, 
+        arguments are same as :func:`~known.basic.Kio.imap_load` """
+        yield from __class__._imap_(__class__.save_file, ((o, path, ioas) for o,path in pairs), workers, use_process, ordered, **kwargs)
+
+    @staticmethod
+    def load_many(paths:Iterable[str], ioas:str, workers:Union[None, int]=None, use_process:bool=False, **kwargs) -> list:
+        r""" loads many files in parallel, returns a list of 2-tuples ``(object, error)`` in input order, see :func:`~known.basic.Kio.imap_load` """
+        return [ (o, e) for _,o,e in __class__.imap_load(paths, ioas, workers, use_process, True, **kwargs) ]
+
+    @staticmethod
+    def save_many(pairs:Iterable[tuple], ioas:str, workers:Union[None, int]=None, use_process:bool=False, **kwargs) -> list:
+        r""" saves many ``(object, path)`` pairs in parallel, returns a list of 2-tuples ``(path, error)`` in input order, see :func:`~known.basic.Kio.imap_save` """
+        return [ (p, e) for _,p,e in __class__.imap_save(pairs, ioas, workers, use_process, True, **kwargs) ]
+
+    @staticmethod
+    def save_shm(o:Any, min_size:Union[None, int]=None) -> 'KioShm':
+        r""" places an object in a new shared memory segment, see :func:`~known.basic.KioShm.put` """
+        return KioShm.put(o, min_size)
+
+    @staticmethod
+    def load_shm(descriptor:tuple) -> 'KioShm':
+        r""" maps an object from a shared memory segment without copying, see :func:`~known.basic.KioShm.get` """
+        return KioShm.get(descriptor)
+
+    @staticmethod
+    def save_npy(o:Any, path:str) -> str:
+        r""" saves an array-like object in ``.npy`` format (no pickling) so that it can be memory-mapped later 
+        
+        .. note:: the file is written at ``path`` as it is, no ``.npy`` extension is appended
+        """
+        import numpy as np
+        with open(path, 'wb') as f: np.save(f, np.asanyarray(o), allow_pickle=False)
+        return path
+
+    @staticmethod
+    def load_npy(path:str, mmap_mode:Union[None, str]='r'):
+        r""" loads an array from a ``.npy`` file
+        
+        :param mmap_mode:   if `None`, reads the whole array into memory, otherwise returns a ``numpy.memmap`` 
+                            opened with this mode - ``'r'`` (read-only) or ``'c'`` (copy-on-write, changes stay in memory) or 
+                            ``'r+'`` (read-write, changes are written to file)
+        
+        .. note:: memory-mapped arrays are read lazily (only the slices that are accessed) 
+            and share the page cache across processes that map the same file
+        """
+        import numpy as np
+        return np.load(path, mmap_mode=mmap_mode, allow_pickle=False)
+
+#=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class KioCache:
+    r""" An LRU cache in front of :func:`~known.basic.Kio.load_file` for files that are loaded repeatedly.
+
+    Entries are keyed on ``(path, ioas, mtime_ns, size)`` so that a changed file is reloaded automatically.
+    The cache is bounded by number of entries and (approximately) by bytes - the size of the file on disk is used as the size of an entry.
+
+    :param max_entries:     maximum number of cached objects
+    :param max_bytes:       maximum total size of cached files (in bytes), if `None`, no limit on size
+    :param copy:            if `True`, returns a deep copy of the cached object so that callers cannot modify the cached one
+
+    .. note:: counters ``hits``, ``misses`` and ``evictions`` can be read using :func:`~known.basic.KioCache.stats`
+    """
+
+    def __init__(self, max_entries:int=128, max_bytes:Union[None, int]=None, copy:bool=False) -> None:
+        assert max_entries>0, f'max_entries should be positive, got {max_entries}'
+        self.max_entries, self.max_bytes, self.copy = max_entries, max_bytes, copy
+        self.data = OrderedDict() # (path, ioas, kwargs) -> (mtime_ns, size, object)
+        self.nbytes = 0
+        self.hits, self.misses, self.evictions = 0, 0, 0
+        self.lock = threading.Lock()
+
+    def load_file(self, path:str, ioas:str, copy:Union[None, bool]=None, **kwargs):
+        r""" same as :func:`~known.basic.Kio.load_file` but returns the cached object if the file has not changed 
+        
+        :param copy: overrides the ``copy`` argument provided at construction
+        """
+        st = os.stat(path)
+        key, stamp = (os.path.abspath(path), f'{ioas}', tuple(sorted(kwargs.items()))), (st.st_mtime_ns, st.st_size)
+        with self.lock:
+            entry = self.data.get(key, None)
+            hit = (entry is not None and entry[:2] == stamp)
+            if hit:
+                self.data.move_to_end(key)
+                self.hits += 1
+                o = entry[2]
+        if not hit:
+            o = Kio.load_file(path, ioas, **kwargs)
+            with self.lock:
+                self.misses += 1
+                self._pop_(key)
+                self.data[key] = (*stamp, o)
+                self.nbytes += stamp[1]
+                while len(self.data)>1 and (len(self.data)>self.max_entries or (self.max_bytes is not None and self.nbytes>self.max_bytes)):
+                    self._pop_(next(iter(self.data)))
+                    self.evictions += 1
+        return deepcopy(o) if (self.copy if copy is None else copy) else o
+
+    def _pop_(self, key):
+        # removes an entry (if exists) and updates size - call with lock held
+        entry = self.data.pop(key, None)
+        if entry is not None: self.nbytes -= entry[1]
+
+    def invalidate(self, path:str) -> int:
+        r""" removes all entries of a file, returns the number of entries removed """
+        path = os.path.abspath(path)
+        with self.lock:
+            keys = [k for k in self.data if k[0]==path]
+            for k in keys: self._pop_(k)
+        return len(keys)
+
+    def clear(self) -> None:
+        r""" removes all entries, counters are not reset """
+        with self.lock:
+            self.data.clear()
+            self.nbytes = 0
+
+    def stats(self) -> dict:
+        r""" returns a dict of counters and current size """
+        with self.lock: return dict(hits=self.hits, misses=self.misses, evictions=self.evictions, entries=len(self.data), nbytes=self.nbytes)
+
+    def __len__(self): return len(self.data)
+
+#=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class KioSaver:
+    r""" Write-behind saver - serializes and writes objects in background using :func:`~known.basic.Kio.save_file_atomic`.
+
+    Repeated saves to the same path are coalesced, if a save is still waiting when a new one arrives, only the latest object is written.
+    Saves to the same path never run concurrently and files are renamed on completion so that readers never see torn files.
+
+    :param workers:         number of background workers
+    :param max_pending:     maximum number of paths waiting or being written, :func:`~known.basic.KioSaver.save_file` blocks when this is reached
+    :param use_process:     if `True`, uses a process pool instead of a thread pool (objects must be picklable)
+
+    .. warning:: objects are serialized later (in background), do not modify an object after passing it to ``save_file`` - pass a copy instead
+
+    .. note:: use as a context manager or call :func:`~known.basic.KioSaver.close` to wait for all writes to finish
+    """
+
+    def __init__(self, workers:int=1, max_pending:int=64, use_process:bool=False) -> None:
+        assert max_pending>0, f'max_pending should be positive, got {max_pending}'
+        self.max_pending = max_pending
+        self.executor = (ProcessPoolExecutor if use_process else ThreadPoolExecutor)(max_workers=workers)
+        self.pending = {} # path -> (o, ioas, kwargs) waiting to be submitted
+        self.running = set() # paths being written
+        self.errors = [] # list of (path, exception)
+        self.saved, self.coalesced = 0, 0
+        self.cond = threading.Condition()
+        self.closed = False
+
+    def save_file(self, o:Any, path:str, ioas:str, **kwargs) -> str:
+        r""" queues an object to be saved at ``path``, arguments are same as :func:`~known.basic.Kio.save_file` """
+        path = os.path.abspath(path)
+        with self.cond:
+            assert not self.closed, f'saver is closed'
+            if path in self.pending: # not yet started - latest wins
+                self.pending[path] = (o, ioas, kwargs)
+                self.coalesced += 1
+                return path
+            while len(self.pending) + len(self.running) >= self.max_pending: self.cond.wait() # backpressure
+            self.pending[path] = (o, ioas, kwargs)
+            if path not in self.running: self._submit_(path)
+        return path
+
+    def _submit_(self, path):
+        # moves a pending save to executor - call with lock held
+        o, ioas, kwargs = self.pending.pop(path)
+        self.running.add(path)
+        self.executor.submit(Kio.save_file_atomic, o, path, ioas, **kwargs).add_done_callback(lambda future: self._done_(path, future))
+
+    def _done_(self, path, future):
+        with self.cond:
+            self.running.discard(path)
+            error = future.exception()
+            if error is None:   self.saved += 1
+            else:               self.errors.append((path, error))
+            if path in self.pending: self._submit_(path) # a newer save arrived while writing
+            self.cond.notify_all()
+
+    def flush(self, timeout:Union[None, float]=None) -> list:
+        r""" blocks until all queued saves are written, returns (and clears) the list of ``(path, exception)`` for failed saves """
+        with self.cond:
+            self.cond.wait_for(lambda: not (self.pending or self.running), timeout)
+            errors, self.errors = self.errors, []
+        return errors
+
+    def close(self) -> list:
+        r""" flushes and shuts down the workers, returns the errors as in :func:`~known.basic.KioSaver.flush` """
+        with self.cond: self.closed = True
+        errors = self.flush()
+        self.executor.shutdown(wait=True)
+        return errors
+
+    def __enter__(self): return self
+
+    def __exit__(self, *exc): self.close()
+
+#=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class JsonlWriter:
+    r""" Appends records to a JSON Lines file, the file handle is kept open across calls.
+
+    :param path:    path of file, created if not existing, appended otherwise
+    :param codec:   compression codec, if `None`, it is inferred from extension of ``path``
+    :param level:   compression level for the codec
+
+    .. note:: records are buffered, call :func:`~known.basic.JsonlWriter.flush` to make them visible to readers
+
+    .. seealso::
+        :func:`~known.basic.Kio.iter_jsonl`
+    """
+
+    def __init__(self, path:str, codec:Union[None, str]=None, level:Union[None, int]=None, **kwargs) -> None:
+        self.path, self.kwargs = path, kwargs # kwargs are passed to json.dumps
+        self.stream = Kio.open_stream(path, 'at', Kio.codec_of(path) if codec is None else codec, level)
+        self.f = self.stream.__enter__()
+        self.count = 0
+
+    def write(self, record:Any) -> None:
+        r""" appends a single record """
+        self.f.write(json.dumps(record, **self.kwargs) + '\n')
+        self.count += 1
+
+    def write_many(self, records:Iterable) -> None:
+        r""" appends all records in an iterable """
+        for r in records: self.write(r)
+
+    def flush(self) -> None: self.f.flush()
+
+    def close(self) -> None:
+        if self.f is None: return
+        self.stream.__exit__(None, None, None)
+        self.f = None
+
+    def __enter__(self): return self
+
+    def __exit__(self, *exc): self.close()
+
+#=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class KioStore:
+    r""" A sharded, indexed, append-only object store inside a folder.
+
+    Records are pickled and appended to one of ``shards`` files (chosen by hash of key), 
+    an in-memory index maps ``key -> (shard, offset, length)`` so that any record can be read with a single seek.
+    Overwriting or deleting a key appends a new record, the old one becomes garbage that can be removed by :func:`~known.basic.KioStore.compact`.
+
+    :param folder:      path of folder that contains shard files and index, created if not existing
+    :param shards:      number of shard files, only used when creating a new store
+
+    .. note:: the index is saved on :func:`~known.basic.KioStore.flush` and :func:`~known.basic.KioStore.close`, 
+        records appended after the last saved index are recovered by scanning the tail of each shard on next open
+
+    .. warning:: keys are hashed using their string representation ``f'{key}'``, which should be deterministic across runs
+    """
+
+    INDEX = 'index.pkl'
+    SHARD = 'shard_{}.bin'
+    SHARD_GEN = 'shard_{}.g{}.bin' # shard files written by compact, generation is saved in index
+
+    def __init__(self, folder:str, shards:int=16) -> None:
+        self.folder = os.path.abspath(folder)
+        os.makedirs(self.folder, exist_ok=True)
+        index_path = os.path.join(self.folder, __class__.INDEX)
+        self.gen = 0
+        if os.path.isfile(index_path): 
+            saved = Kio.load_file(index_path, 'pickle')
+            shards, sizes, self.index = saved[:3]
+            if len(saved)>3: self.gen = saved[3]
+        else: sizes, self.index = [0 for _ in range(shards)], {}
+        assert shards>0, f'shards should be positive, got {shards}'
+        self.shards = shards
+        self._remove_stale_()
+        self.files = [ open(self.shard_path(i), 'a+b') for i in range(shards) ]
+        self.lock = threading.RLock()
+        for i,size in enumerate(sizes): self._scan_(i, size) # recover records not in saved index
+
+    def shard_path(self, i:int, gen:Union[None, int]=None) -> str: 
+        if gen is None: gen = self.gen
+        return os.path.join(self.folder, (__class__.SHARD.format(i) if gen==0 else __class__.SHARD_GEN.format(i, gen)))
+
+    def _remove_stale_(self) -> None:
+        # removes shard files of other generations - left behind by a compaction that was interrupted (before or after its commit)
+        current = set(os.path.basename(self.shard_path(i)) for i in range(self.shards))
+        for name in os.listdir(self.folder):
+            if name.startswith('shard_') and (name.endswith('.bin') or name.endswith('.tmp')) and name not in current: 
+                os.remove(os.path.join(self.folder, name))
+
+    def shard_of(self, key) -> int: return zlib.crc32(f'{key}'.encode()) % self.shards
+
+    def _scan_(self, i:int, start:int) -> None:
+        # reads records in shard i from offset start till end and updates index, a torn record at the end (from a crash) is truncated
+        f = self.files[i]
+        end = f.seek(0, 2)
+        f.seek(start)
+        while f.tell() < end:
+            offset = f.tell()
+            try: record = pickle.load(f)
+            except (EOFError, pickle.UnpicklingError, ValueError, IndexError): 
+                f.truncate(offset)
+                break
+            if len(record)>1:   self.index[record[0]] = (i, offset, f.tell()-offset)
+            else:               self.index.pop(record[0], None) # tombstone
+
+    def _append_(self, i:int, record:tuple) -> tuple:
+        data = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        f = self.files[i]
+        offset = f.seek(0, 2)
+        f.write(data)
+        return (i, offset, len(data))
+
+    def put(self, key, value) -> None:
+        r""" appends a record, overwrites the key if existing """
+        with self.lock: self.index[key] = self._append_(self.shard_of(key), (key, value))
+
+    def get(self, key, default=None):
+        r""" reads a single record """
+        with self.lock:
+            loc = self.index.get(key, None)
+            if loc is None: return default
+            i, offset, length = loc
+            f = self.files[i]
+            f.flush()
+            f.seek(offset)
+            return pickle.loads(f.read(length))[1]
+
+    def get_many(self, keys:Iterable, default=None) -> list:
+        r""" reads many records in one pass - reads are sorted by shard and offset, returns a list in the order of keys """
+        keys = list(keys)
+        res = [default for _ in keys]
+        with self.lock:
+            locs = sorted( (self.index[k], j) for j,k in enumerate(keys) if k in self.index )
+            for f in self.files: f.flush()
+            for (i, offset, length), j in locs:
+                f = self.files[i]
+                f.seek(offset)
+                res[j] = pickle.loads(f.read(length))[1]
+        return res
+
+    def delete(self, key) -> bool:
+        r""" deletes a key (appends a tombstone), returns `False` if key was not found """
+        with self.lock:
+            if key not in self.index: return False
+            self._append_(self.index.pop(key)[0], (key,))
+            return True
+
+    def __getitem__(self, key):
+        with self.lock:
+            if key not in self.index: raise KeyError(key)
+            return self.get(key)
+
+    def __setitem__(self, key, value): self.put(key, value)
+
+    def __delitem__(self, key):
+        if not self.delete(key): raise KeyError(key)
+
+    def __contains__(self, key): return key in self.index
+
+    def __len__(self): return len(self.index)
+
+    def __iter__(self): return iter(list(self.index))
+
+    def keys(self): return list(self.index)
+
+    def sizes(self) -> list:
+        r""" returns the size (bytes) of each shard file """
+        with self.lock: return [ f.seek(0, 2) for f in self.files ]
+
+    def flush(self) -> None:
+        r""" flushes shard files and saves the index """
+        with self.lock:
+            for f in self.files: f.flush()
+            self._save_index_(self.gen, self.sizes(), self.index)
+
+    def _save_index_(self, gen:int, sizes:list, index:dict) -> None:
+        Kio.save_file_atomic((self.shards, sizes, index, gen), os.path.join(self.folder, __class__.INDEX), 'pickle')
+
+    def compact(self) -> int:
+        r""" rewrites each shard with live records only, returns number of bytes reclaimed 
+
+        Shards are written as a new generation of files, saving the index (with new generation) is the single commit step,
+        old files are deleted after that. If interrupted, the store opens with either the old or the new generation.
+        
+        .. note:: should be run offline - blocks all other operations on this store till it finishes
+        """
+        with self.lock:
+            for f in self.files: f.flush()
+            gen, index, sizes = self.gen+1, {}, []
+            for i in range(self.shards):
+                live = sorted( (loc[1], loc[2], k) for k,loc in self.index.items() if loc[0]==i )
+                f = self.files[i]
+                with open(self.shard_path(i, gen), 'wb') as g:
+                    for offset, length, k in live:
+                        f.seek(offset)
+                        index[k] = (i, g.tell(), length)
+                        g.write(f.read(length))
+                    g.flush()
+                    os.fsync(g.fileno())
+                    sizes.append(g.tell())
+            before = self.sizes()
+            self._save_index_(gen, sizes, index) # commit
+            old = [ self.shard_path(i) for i in range(self.shards) ]
+            for f in self.files: f.close()
+            self.gen, self.index = gen, index
+            self.files = [ open(self.shard_path(i), 'a+b') for i in range(self.shards) ]
+            for p in old: os.remove(p)
+        return sum(before) - sum(sizes)
+
+    def close(self) -> None:
+        if not self.files: return
+        self.flush()
+        for f in self.files: f.close()
+        self.files = []
+
+    def __enter__(self): return self
+
+    def __exit__(self, *exc): self.close()
+
+#=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class KioColumns:
+    r""" Columnar storage for a list of homogeneous dicts (records) - each field is stored as a NumPy array.
+
+    Fields are stored according to the type of their values (``None`` values are allowed)
+
+        * ``bool`` as ``bool`` array
+        * ``int`` as ``int64`` array, ``float`` (or ``int`` mixed with floats or ``None``) as ``float64`` array with ``None`` as ``nan``
+        * ``str`` as ``int32`` codes into a table of unique strings, ``None`` has code ``-1``
+        * anything else (lists, dicts, ...) as codes into a table of unique json strings
+
+    Use :func:`~known.basic.KioColumns.from_records` to create, :func:`~known.basic.KioColumns.save` and :func:`~known.basic.KioColumns.load` for files.
+    A loaded object reads columns only when they are accessed (optionally memory-mapped) so loading only the needed fields is cheap.
+
+    .. note:: requires ``numpy``
+    """
+
+    MAGIC = b'KCOL'
+    ALIGN = 64
+
+    def __init__(self, nrows:int, fields:dict, path:Union[None, str]=None, mmap_mode:Union[None, str]=None) -> None:
+        # fields is a dict of { name : (kind, parts) } 
+        # where parts is either a list of arrays or a list of (dtype, offset, count) when loading lazily from path
+        self.nrows, self.fields, self.path, self.mmap_mode = nrows, fields, path, mmap_mode
+        self.cache = {} # name -> list of arrays
+
+    FLOAT_EXACT = 2**53 # largest magnitude up to which all integers are exact in float64
+
+    @staticmethod
+    def _type_(v) -> str:
+        # classifies a value (python or numpy scalar) as 'bool', 'int', 'float', 'str' or 'other'
+        if isinstance(v, bool) or getattr(getattr(v, 'dtype', None), 'kind', None) == 'b': return 'bool'
+        if isinstance(v, numbers.Integral):  return 'int'
+        if isinstance(v, numbers.Real):      return 'float'
+        if isinstance(v, str):               return 'str'
+        return 'other'
+
+    @staticmethod
+    def _json_default_(v):
+        # makes numpy scalars and arrays json serializable
+        if hasattr(v, 'tolist'): return v.tolist()
+        raise TypeError(f'Object of type {type(v).__name__} is not JSON serializable')
+
+    @staticmethod
+    def _kind_(values:list) -> str:
+        types = set(__class__._type_(v) for v in values if v is not None)
+        has_none = len(values) > sum(v is not None for v in values)
+        if types == {'bool'}:                   return 'json' if has_none else 'bool'
+        if types == {'int'} and not has_none:   return 'int'
+        if types and types <= {'int', 'float'}: 
+            # ints are stored as float64 (with NaN for None) only if they are exact in float64
+            exact = all(-__class__.FLOAT_EXACT <= int(v) <= __class__.FLOAT_EXACT for v in values if v is not None and __class__._type_(v) == 'int')
+            return 'float' if exact else 'json'
+        if types == {'str'}:                    return 'str'
+        return 'json'
+
+    @staticmethod
+    def from_records(records:Iterable[dict]) -> 'KioColumns':
+        r""" creates columns from a list of dicts, fields are collected from all records in order of appearance """
+        import numpy as np
+        records = records if isinstance(records, list) else list(records)
+        names = {}
+        for r in records: names.update(dict.fromkeys(r))
+        fields = {}
+        for name in names:
+            values = [ r.get(name, None) for r in records ]
+            kind = __class__._kind_(values)
+            if kind == 'int':
+                try: fields[name] = (kind, [np.array(values, dtype=np.int64)])
+                except OverflowError: kind = 'json'
+            if kind == 'bool':  fields[name] = (kind, [np.array(values, dtype=np.bool_)])
+            if kind == 'float': fields[name] = (kind, [np.array([np.nan if v is None else v for v in values], dtype=np.float64)])
+            if kind in ('str', 'json'):
+                if kind == 'json': values = [ None if v is None else json.dumps(v, default=__class__._json_default_) for v in values ]
+                else: values = [ None if v is None else str(v) for v in values ] # np.str_ to str
+                table = {}
+                codes = np.array([ -1 if v is None else table.setdefault(v, len(table)) for v in values ], dtype=np.int32)
+                encoded = [ t.encode('utf-8') for t in table ]
+                offsets = np.zeros(len(encoded)+1, dtype=np.int64)
+                np.cumsum([len(e) for e in encoded], out=offsets[1:])
+                fields[name] = (kind, [codes, offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8)])
+        return __class__(len(records), fields)
+
+    def _parts_(self, name) -> list:
+        # arrays of a field - loads from file if required
+        parts = self.cache.get(name, None)
+        if parts is None:
+            import numpy as np
+            kind, parts = self.fields[name]
+            if self.path is not None:
+                if self.mmap_mode: parts = [ (np.memmap(self.path, dtype=d, mode=self.mmap_mode, offset=o, shape=(c,)) if c else np.zeros(0, dtype=d)) for d,o,c in parts ]
+                else: parts = [ np.fromfile(self.path, dtype=d, count=c, offset=o) for d,o,c in parts ]
+            self.cache[name] = parts
+        return parts
+
+    def names(self) -> list: return list(self.fields)
+
+    def kind(self, name) -> str: return self.fields[name][0]
+
+    def table(self, name) -> list:
+        r""" the string table of a ``str`` or ``json`` field """
+        assert self.kind(name) in ('str', 'json'), f'field {name} has no table'
+        _, offsets, data = self._parts_(name)
+        data = bytes(data)
+        return [ data[offsets[i]:offsets[i+1]].decode('utf-8') for i in range(len(offsets)-1) ]
+
+    def codes(self, name):
+        r""" the ``int32`` codes (index into :func:`~known.basic.KioColumns.table`) of a ``str`` or ``json`` field """
+        assert self.kind(name) in ('str', 'json'), f'field {name} has no codes'
+        return self._parts_(name)[0]
+
+    def column(self, name):
+        r""" returns a field as an ndarray - ``str`` and ``json`` fields are decoded into an object array """
+        kind, parts = self.kind(name), self._parts_(name)
+        if kind not in ('str', 'json'): return parts[0]
+        import numpy as np
+        table = self.table(name)
+        if kind == 'json': table = [ json.loads(t) for t in table ]
+        lookup = np.empty(len(table)+1, dtype=object) # last one is None for code -1
+        lookup[:-1] = table
+        return lookup[parts[0]]
+
+    def row(self, i:int) -> dict:
+        r""" returns a single record as a dict """
+        res = {}
+        for name,(kind,_) in self.fields.items():
+            parts = self._parts_(name)
+            if kind in ('str', 'json'):
+                code, (_, offsets, data) = int(parts[0][i]), parts
+                v = None if code<0 else bytes(data[offsets[code]:offsets[code+1]]).decode('utf-8')
+                res[name] = json.loads(v) if (kind == 'json' and v is not None) else v
+            else: res[name] = parts[0][i].item()
+        return res
+
+    def to_records(self) -> list: 
+        r""" converts back to a list of dicts (``nan`` in float fields stays ``nan``) """
+        return [ self.row(i) for i in range(self.nrows) ]
+
+    def __len__(self): return self.nrows
+
+    def __getitem__(self, key): return self.row(key) if isinstance(key, int) else self.column(key)
+
+    def __repr__(self) -> str: return f'{__class__} :: {self.nrows} Rows x {len(self.fields)} Fields'
+
+    def save(self, path:str) -> str:
+        r""" saves in a binary layout - a json header followed by aligned raw arrays """
+        align = __class__.ALIGN
+        blobs, header = [], dict(nrows=self.nrows, fields={})
+        offset = 0
+        for name,(kind,_) in self.fields.items():
+            parts = []
+            for a in self._parts_(name):
+                offset += (-offset) % align
+                parts.append((a.dtype.str, offset, len(a)))
+                blobs.append((offset, a))
+                offset += a.nbytes
+            header['fields'][name] = (kind, parts)
+        head = json.dumps(header).encode('utf-8')
+        start = len(__class__.MAGIC) + 8 + len(head)
+        start += (-start) % align
+        with open(path, 'wb') as f:
+            f.write(__class__.MAGIC + start.to_bytes(8, 'little') + head)
+            for o,a in blobs:
+                f.seek(start + o)
+                f.write(memoryview(a).cast('B') if a.nbytes else b'')
+        return path
+
+    @staticmethod
+    def load(path:str, fields:Union[None, Iterable[str]]=None, mmap_mode:Union[None, str]=None) -> 'KioColumns':
+        r""" loads the header only, columns are read when accessed
+
+        :param fields:      if provided, only these fields are available
+        :param mmap_mode:   if `None`, columns are read into memory, otherwise they are ``numpy.memmap`` opened with this mode (``'r'`` or ``'c'``)
+        """
+        with open(path, 'rb') as f:
+            assert f.read(len(__class__.MAGIC)) == __class__.MAGIC, f'not a columns file {path}'
+            start = int.from_bytes(f.read(8), 'little')
+            header = json.loads(f.read(start - len(__class__.MAGIC) - 8).rstrip(b'\x00'))
+        names = header['fields'] if fields is None else fields
+        return __class__(header['nrows'], { name : (header['fields'][name][0], [ (d, start+o, c) for d,o,c in header['fields'][name][1] ]) for name in names }, path, mmap_mode)
+
+#=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class KioShm:
+    r""" Transports objects between processes using a named shared memory segment.
+
+    The object is pickled (protocol 5) with large buffers out-of-band (see :func:`~known.basic.Kio.save_buffer_oob`),
+    the pickle stream and the buffers are copied once into a segment and only a small ``descriptor`` (a tuple) needs to be sent to other processes.
+    Receivers map the segment and rebuild the object over it without copying.
+
+    .. code-block:: python
+
+        with Kio.save_shm(big_dict_of_arrays) as owner:         # creates segment, unlinks on exit
+            pool.map(work, [owner.descriptor for _ in range(n)])
+
+        def work(descriptor):
+            with Kio.load_shm(descriptor) as shm:               # maps segment, closes on exit
+                o = shm.object                                  # do not keep references after exit
+
+    .. warning:: objects loaded from a segment are views into it - 
+        the segment cannot be closed while they are alive and changes made to them are visible to all processes
+    """
+
+    ALIGN = 64
+
+    def __init__(self, shm:SharedMemory, descriptor:tuple, owner:bool, o:Any=None) -> None:
+        self.shm, self.descriptor, self.owner, self.object = shm, descriptor, owner, o
+
+    @staticmethod
+    def put(o:Any, min_size:Union[None, int]=None) -> 'KioShm':
+        r""" creates a segment containing the object, the returned instance is the owner that should :func:`~known.basic.KioShm.unlink` it 
+
+        :param min_size: buffers smaller than this are kept in the pickle stream, see :func:`~known.basic.Kio.save_buffer_oob`
+        """
+        buffer, buffers = Kio.save_buffer_oob(o, min_size=min_size)
+        stream = buffer.getbuffer()
+        align, parts, size = __class__.ALIGN, [], stream.nbytes
+        for m in buffers:
+            size += (-size) % align
+            parts.append((size, m.nbytes))
+            size += m.nbytes
+        shm = SharedMemory(create=True, size=max(size, 1))
+        shm.buf[:stream.nbytes] = stream
+        for (offset, nbytes), m in zip(parts, buffers): shm.buf[offset:offset+nbytes] = m
+        del stream
+        return __class__(shm, (shm.name, buffer.tell(), tuple(parts)), True)
+
+    @staticmethod
+    def get(descriptor:tuple) -> 'KioShm':
+        r""" maps a segment created by :func:`~known.basic.KioShm.put` and loads the object into ``.object`` """
+        name, nbytes, parts = descriptor
+        try:                shm = SharedMemory(name=name, track=False) # python>=3.13, owner is responsible for unlink
+        except TypeError:   shm = SharedMemory(name=name)
+        o = pickle.loads(shm.buf[:nbytes], buffers=[ shm.buf[offset:offset+n] for offset,n in parts ])
+        return __class__(shm, descriptor, False, o)
+
+    def close(self) -> bool:
+        r""" releases the object and closes the mapping in this process, 
+        returns `False` if the mapping could not be closed because references to loaded objects still exist """
+        self.object = None
+        if self.shm is None: return True
+        try: self.shm.close()
+        except BufferError: return False
+        self.shm = None
+        return True
+
+    def unlink(self) -> None:
+        r""" removes the segment from the system, it is freed after all processes close it (owner only) """
+        assert self.owner, f'only the owner can unlink'
+        try: SharedMemory(name=self.descriptor[0]).unlink() if self.shm is None else self.shm.unlink()
+        except FileNotFoundError: pass
+
+    def __enter__(self): return self
+
+    def __exit__(self, *exc):
+        self.close()
+        if self.owner: self.unlink()
+
+#=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class KioLog(UserDict):
+    r""" A dict that persists itself as a snapshot file plus an append-only log of changes.
+
+    Every set and delete is appended to ``{path}.log`` so that a save costs O(changes) instead of O(size of dict).
+    Loading reads the snapshot at ``path`` and replays the log. When the log grows beyond ``ratio`` times the snapshot
+    (and at least ``min_log`` bytes), the dict is compacted - a new snapshot is written (in background) and the log is reset.
+
+    :param path:        path of snapshot file, log files are created next to it
+    :param ratio:       compaction is triggered when size of log exceeds ``ratio * size of snapshot``
+    :param min_log:     minimum size of log (in bytes) before compaction is triggered
+    :param background:  if `True`, snapshots are written in a background thread
+
+    .. warning:: values are pickled when they are set - modifying a value in-place afterwards is not journaled, set it again instead
+
+    .. note:: call :func:`~known.basic.KioLog.close` (or use as a context manager) to flush the log
+    """
+
+    def __init__(self, path:str, ratio:float=1.0, min_log:int=2**20, background:bool=True) -> None:
+        self.path, self.ratio, self.min_log, self.background = os.path.abspath(path), ratio, min_log, background
+        self.log_path, self.old_path = f'{self.path}.log', f'{self.path}.log.old'
+        self.lock = threading.RLock()
+        self.compactor = None # background thread
+        self.data = Kio.load_file(self.path, 'pickle') if os.path.isfile(self.path) else {}
+        for p in (self.old_path, self.log_path): self._replay_(p)
+        self.log = open(self.log_path, 'ab')
+
+    def _replay_(self, path:str) -> None:
+        # applies records of a log file to data, a torn record at the end (from a crash) is truncated
+        if not os.path.isfile(path): return
+        with open(path, 'r+b') as f:
+            good = 0
+            while True:
+                try: record = pickle.load(f)
+                except EOFError: break
+                except (pickle.UnpicklingError, ValueError, IndexError): break
+                if len(record)>1:   self.data[record[0]] = record[1]
+                else:               self.data.pop(record[0], None)
+                good = f.tell()
+            f.truncate(good)
+
+    def _append_(self, record:tuple) -> None:
+        # journals a change that is already applied to data, then compacts if required (the snapshot must include the change)
+        pickle.dump(record, self.log, protocol=pickle.HIGHEST_PROTOCOL)
+        if self.log.tell() > max(self.min_log, self.ratio * self.snapshot_size()): self.compact()
+
+    def __setitem__(self, key, item) -> None:
+        with self.lock:
+            self.data[key] = item
+            self._append_((key, item))
+
+    def __delitem__(self, key) -> None:
+        with self.lock:
+            del self.data[key]
+            self._append_((key,))
+
+    def __ior__(self, other):
+        self.update(other) # journals each item through __setitem__
+        return self
+
+    def __or__(self, other): return dict(self.data) | dict(other.data if isinstance(other, UserDict) else other)
+
+    def __ror__(self, other): return dict(other.data if isinstance(other, UserDict) else other) | dict(self.data)
+
+    def copy(self) -> dict: 
+        r""" returns a plain dict (a copy would share the log of this dict) """
+        return dict(self.data)
+
+    def __copy__(self) -> dict: return self.copy()
+
+    def snapshot_size(self) -> int: return os.path.getsize(self.path) if os.path.isfile(self.path) else 0
+
+    def log_size(self) -> int: 
+        with self.lock: return self.log.tell()
+
+    def compact(self, wait:bool=False) -> None:
+        r""" writes a new snapshot and resets the log, does nothing if a compaction is already running 
+        
+        :param wait: if `True`, blocks until the snapshot is written
+        """
+        with self.lock:
+            if self.compactor is not None and self.compactor.is_alive(): 
+                compactor = self.compactor
+            else:
+                # rotate the log, changes from now on go to a new log while the snapshot is written
+                self.log.close()
+                if os.path.isfile(self.old_path): self._merge_old_()
+                else: os.replace(self.log_path, self.old_path)
+                self.log = open(self.log_path, 'ab')
+                compactor = threading.Thread(target=self._snapshot_, args=(dict(self.data),), daemon=False)
+                self.compactor = compactor
+                if self.background: compactor.start()
+        if not self.background: compactor.run()
+        elif wait: compactor.join()
+
+    def _merge_old_(self) -> None:
+        # a previous snapshot failed - keep its old log by appending the current log to it
+        with open(self.old_path, 'ab') as g, open(self.log_path, 'rb') as f: 
+            while True:
+                chunk = f.read(2**20)
+                if not chunk: break
+                g.write(chunk)
+        os.remove(self.log_path)
+
+    def _snapshot_(self, data:dict) -> None:
+        Kio.save_file_atomic(data, self.path, 'pickle') # codec is inferred from extension of path (same as loading)
+        os.remove(self.old_path) # replaying it over the new snapshot would be harmless but it is no longer needed
+
+    def flush(self, fsync:bool=False) -> None:
+        r""" flushes the log to disk """
+        with self.lock:
+            self.log.flush()
+            if fsync: os.fsync(self.log.fileno())
+
+    def close(self) -> None:
+        r""" waits for a running compaction and closes the log """
+        if self.compactor is not None and self.background and self.compactor.is_alive(): self.compactor.join()
+        with self.lock:
+            if not self.log.closed: self.log.close()
+
+    def __enter__(self): return self
+
+    def __exit__(self, *exc): self.close()
+
+    def __repr__(self) -> str: return f'{__class__} :: {len(self)} Members'
+
 #=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
 
 class Verbose:
@@ -113,66 +1192,133 @@ class Verbose:
         r""" Repeates a string n-times """
         return ''.join([s for _ in range(n)])
 
+    class _Writer:
+        # buffers text parts and writes them to a stream in large chunks, stops (raises Full) after max_chars characters
+        class Full(Exception): pass
+        def __init__(self, stream, max_chars:Union[None, int]=None, chunk:int=2**16) -> None:
+            self.stream, self.max_chars, self.chunk = stream, max_chars, chunk
+            self.parts, self.pending, self.total = [], 0, 0
+        def write(self, s:str) -> None:
+            if self.max_chars is not None and self.total + len(s) > self.max_chars:
+                s = s[:max(0, self.max_chars - self.total)]
+                self.parts.append(s)
+                self.total += len(s)
+                raise __class__.Full()
+            self.parts.append(s)
+            self.total += len(s)
+            self.pending += len(s)
+            if self.pending >= self.chunk: self.flush()
+        def flush(self) -> None:
+            if self.parts: self.stream.write(''.join(self.parts))
+            self.parts, self.pending = [], 0
+
     @staticmethod
-    def _recP_(a, level, index, pindex, tabchar='\t', show_dim=False):
+    def _recP_(a, level, index, pindex, tabchar='\t', show_dim=False, writer=None, edgeitems=None, max_depth=None):
         # helper function for recP - do not use directly
         if index<0: index=''
         dimstr = ('* ' if level<1 else f'*{level-1} ') if show_dim else ''
         pindex = f'{pindex}{index}'
+        tabs = tabchar*level
         if len(a.shape)==0:
-            print(f'{__class__.strN(tabchar, level)}[ {dimstr}@{pindex}\t {a} ]') 
+            writer.write(f'{tabs}[ {dimstr}@{pindex}\t {a} ]\n') 
+        elif max_depth is not None and level>=max_depth:
+            writer.write(f'{tabs}[ {dimstr}@{pindex} #{a.shape[0]} ... ]\n')
         else:
-            print(f'{__class__.strN(tabchar, level)}[ {dimstr}@{pindex} #{a.shape[0]}')
-            for i,s in enumerate(a):
-                __class__._recP_(s, level+1, i, pindex, tabchar, show_dim)
-            print(f'{__class__.strN(tabchar, level)}]')
+            n = a.shape[0]
+            writer.write(f'{tabs}[ {dimstr}@{pindex} #{n}\n')
+            if edgeitems is not None and n > 2*edgeitems: # summarize
+                for i in range(edgeitems): __class__._recP_(a[i], level+1, i, pindex, tabchar, show_dim, writer, edgeitems, max_depth)
+                writer.write(f'{tabs}{tabchar}...\n')
+                for i in range(n-edgeitems, n): __class__._recP_(a[i], level+1, i, pindex, tabchar, show_dim, writer, edgeitems, max_depth)
+            else:
+                for i,s in enumerate(a): __class__._recP_(s, level+1, i, pindex, tabchar, show_dim, writer, edgeitems, max_depth)
+            writer.write(f'{tabs}]\n')
 
     @staticmethod
-    def recP(arr:Iterable, show_dim:bool=False) -> None: 
+    def render(arr:Iterable, stream=None, show_dim:bool=False, tabchar:str='\t', 
+               threshold:Union[None, int]=1000, edgeitems:int=3, max_depth:Union[None, int]=None, max_chars:Union[None, int]=None) -> None:
+        r"""
+        Renders an iterable recursively (same format as :func:`~known.basic.Verbose.recP`) into a stream using a single buffered writer.
+
+        :param arr:         any iterable with ``shape`` property.
+        :param stream:      a text stream to write into, if `None`, uses ``sys.stdout``
+        :param show_dim:    if `True`, prints the dimension at the start of each item
+        :param threshold:   if total no of elements exceeds this, only ``edgeitems`` at the start and end of each dimension are shown (like numpy), 
+                            if `None`, never summarizes
+        :param edgeitems:   no of items shown at each edge when summarizing
+        :param max_depth:   dimensions deeper than this are not expanded
+        :param max_chars:   output is cut after these many characters
+        """
+        if stream is None: 
+            import sys
+            stream = sys.stdout
+        size = 1
+        for d in arr.shape: size *= d
+        writer = __class__._Writer(stream, max_chars)
+        try: __class__._recP_(arr, 0, -1, '', tabchar, show_dim, writer, (edgeitems if (threshold is not None and size > threshold) else None), max_depth)
+        except __class__._Writer.Full: 
+            writer.parts.append('\n... (truncated)\n')
+        writer.flush()
+
+    @staticmethod
+    def recP(arr:Iterable, show_dim:bool=False, threshold:Union[None, int]=None, **kwargs) -> None: 
         r"""
         Recursive Print - print an iterable recursively with added indentation.
 
         :param arr:         any iterable with ``shape`` property.
         :param show_dim:    if `True`, prints the dimension at the start of each item
+        :param threshold:   if provided, large iterables are summarized, by default everything is printed
+        :param kwargs:      passed to :func:`~known.basic.Verbose.render` (like ``edgeitems``, ``max_depth`` and ``max_chars``)
         """
-        __class__._recP_(arr, 0, -1, '', '\t', show_dim)
+        __class__.render(arr, None, show_dim, '\t', threshold, **kwargs)
     
     @staticmethod
-    def strA_(arr:Iterable, start:str="", sep:str="|", end:str="") -> str:
+    def _edges_(arr:Iterable, edgeitems:Union[None, int]):
+        # returns (head, tail) items - tail is None if not summarized
+        if edgeitems is None or not hasattr(arr, '__len__') or len(arr) <= 2*edgeitems: return arr, None
+        if not hasattr(arr, '__getitem__'): arr = list(arr)
+        return [arr[i] for i in range(edgeitems)], [arr[i] for i in range(len(arr)-edgeitems, len(arr))]
+
+    @staticmethod
+    def strA_(arr:Iterable, start:str="", sep:str="|", end:str="", edgeitems:Union[None, int]=None) -> str:
         r"""
         String Array - returns a string representation of an iterable for printing.
         
-        :param arr:     input iterable
-        :param start:   string prefix
-        :param sep:     item seperator
-        :param end:     string postfix
+        :param arr:         input iterable
+        :param start:       string prefix
+        :param sep:         item seperator
+        :param end:         string postfix
+        :param edgeitems:   if provided, shows only these many items at the start and end of large iterables
         """
-        res=start
-        for a in arr: res += (str(a) + sep)
-        return res + end
+        head, tail = __class__._edges_(arr, edgeitems)
+        res = ''.join([ f'{a}{sep}' for a in head ])
+        if tail is not None: res += f'...{sep}' + ''.join([ f'{a}{sep}' for a in tail ])
+        return start + res + end
 
     @staticmethod
-    def strA(arr:Iterable, start:str="", sep:str="|", end:str="") -> None: print(__class__.strA_(arr, start, sep, end))
+    def strA(arr:Iterable, start:str="", sep:str="|", end:str="", edgeitems:Union[None, int]=None) -> None: print(__class__.strA_(arr, start, sep, end, edgeitems))
     
     @staticmethod
-    def strD_(arr:Iterable, sep:str="\n", cep:str=":\n", caption:str="") -> str:
+    def strD_(arr:Iterable, sep:str="\n", cep:str=":\n", caption:str="", edgeitems:Union[None, int]=None) -> str:
         r"""
         String Dict - returns a string representation of a dict object for printing.
         
-        :param arr:     input dict
-        :param sep:     item seperator
-        :param cep:     key-value seperator
-        :param caption: heading at the top
+        :param arr:         input dict
+        :param sep:         item seperator
+        :param cep:         key-value seperator
+        :param caption:     heading at the top
+        :param edgeitems:   if provided, shows only these many items at the start and end of large dicts
         """
-        res=f"=-=-=-=-==-=-=-=-={sep}DICT #[{len(arr)}] : {caption}{sep}{__class__.DASHED_LINE}{sep}"
-        for k,v in arr.items(): res+=str(k) + cep + str(v) + sep
-        return f"{res}{__class__.DASHED_LINE}{sep}"
+        head, tail = __class__._edges_(list(arr.items()) if edgeitems is not None else arr.items(), edgeitems)
+        res = ''.join([ f'{k}{cep}{v}{sep}' for k,v in head ])
+        if tail is not None: res += f'...{sep}' + ''.join([ f'{k}{cep}{v}{sep}' for k,v in tail ])
+        return f"=-=-=-=-==-=-=-=-={sep}DICT #[{len(arr)}] : {caption}{sep}{__class__.DASHED_LINE}{sep}{res}{__class__.DASHED_LINE}{sep}"
 
     @staticmethod
-    def strD(arr:Iterable, sep:str="\n", cep:str=":\n", caption:str="") -> None: print(__class__.strD_(arr, sep, cep, caption))
+    def strD(arr:Iterable, sep:str="\n", cep:str=":\n", caption:str="", edgeitems:Union[None, int]=None) -> None: print(__class__.strD_(arr, sep, cep, caption, edgeitems))
 
     @staticmethod
-    def strU(form:Union[None, Iterable[str]], start:str='', sep:str='', end:str='') -> str:
+    def strU(form:Union[None, Iterable[str]], start:str='', sep:str='', end:str='', unique:bool=False) -> str:
         r""" 
         String UID - returns a formated string of current timestamp.
 
@@ -182,19 +1328,34 @@ class Verbose:
         :param start: UID prefix
         :param sep: UID seperator
         :param end: UID postfix
+        :param unique: if `True`, appends process id and a sequence number so that no two calls return the same UID, see :class:`~known.basic.UidGen`
 
         .. seealso::
             :func:`~known.basic.uid`
         """
         if not form: form = __class__.DEFAULT_DATE_FORMAT
+        if unique: return __class__._uid_gen_(tuple(form), start, sep, end)()
         return start + datetime.datetime.strftime(datetime.datetime.now(), sep.join(form)) + end
 
+    _uid_gens = {}
+
+    @staticmethod
+    def _uid_gen_(form:tuple, start:str, sep:str, end:str) -> 'UidGen':
+        # returns a cached UidGen for given format
+        key = (form, start, sep, end)
+        gen = __class__._uid_gens.get(key, None)
+        if gen is None: gen = __class__._uid_gens.setdefault(key, UidGen(form, start, sep, end))
+        return gen
+
     @staticmethod
     def now(year:bool=True, month:bool=True, day:bool=True, 
             hour:bool=True, minute:bool=True, second:bool=True, mirco:bool=True, 
-            start:str='', sep:str='', end:str='') -> str:
+            start:str='', sep:str='', end:str='', unique:bool=False) -> str:
         r""" Unique Identifier - useful in generating unique identifiers based on current timestamp. 
         Helpful in generating unique filenames based on timestamps. 
+
+        If ``unique`` is `True`, appends process id and a sequence number so that no two calls return the same UID, 
+        use :class:`~known.basic.UidGen` directly when generating many UIDs.
         
         .. seealso::
             :func:`~known.basic.Verbose.strU`
@@ -208,6 +1369,7 @@ class Verbose:
         if second:  form.append("%S")
         if mirco:   form.append("%f")
         assert (form), 'format should not be empty!'
+        if unique: return __class__._uid_gen_(tuple(form), start, sep, end)()
         return (start + datetime.datetime.strftime(datetime.datetime.now(), sep.join(form)) + end)
 
     @staticmethod
@@ -305,11 +1467,119 @@ class Verbose:
 
 
     @staticmethod
-    def info(x:Any, show_object:bool=False):
+    def _buffer_(x):
+        # returns (key, nbytes, header) for objects that hold a (possibly shared) data buffer - ndarrays and tensors, else None
+        if hasattr(x, 'untyped_storage') and type(x).__module__.startswith('torch'):
+            storage = x.untyped_storage()
+            return ('t', storage.data_ptr()), storage.nbytes(), getsizeof(x)
+        if hasattr(x, 'flags') and hasattr(x, 'base') and hasattr(x, 'nbytes') and type(x).__module__.startswith('numpy'):
+            root = x
+            while getattr(root, 'base', None) is not None: root = root.base
+            header = getsizeof(x) - (x.nbytes if x.flags.owndata else 0)
+            nbytes = root.nbytes if hasattr(root, 'nbytes') else (len(root) if hasattr(root, '__len__') else getsizeof(root))
+            return ('n', id(root)), nbytes, header
+        return None
+
+    @staticmethod
+    def _children_(x, path:str, sample:Union[None, int]):
+        # returns (children, scale) where children is a list of (child, path) and scale accounts for skipped children when sampling
+        def pick(n):
+            if sample is None or n <= sample: return range(n), 1.0
+            step = n / sample
+            return [int(i*step) for i in range(sample)], n / sample
+        def stride(items, n):
+            # evenly spaced items (same positions as pick) of an iterable that can not be indexed (iterates over all items once)
+            if sample is None or n <= sample: return items, 1.0
+            idx, scale = pick(n)
+            it, prev, res = iter(items), -1, []
+            for i in idx:
+                res.append(next(islice(it, i-prev-1, None)))
+                prev = i
+            return res, scale
+        if isinstance(x, (str, bytes, bytearray, int, float, complex, bool, type(None), range)): return [], 1.0
+        if isinstance(x, dict):
+            items, scale = stride(x.items(), len(x))
+            return [ c for k,v in items for c in ((k, f'{path}.key'), (v, f'{path}[{k!r}]')) ], scale
+        if isinstance(x, (list, tuple)):
+            idx, scale = pick(len(x))
+            return [ (x[i], f'{path}[{i}]') for i in idx ], scale
+        if isinstance(x, (set, frozenset, deque)):
+            items, scale = stride(x, len(x))
+            return [ (v, f'{path}{{}}') for v in items ], scale
+        if hasattr(x, 'dtype') and hasattr(x, 'flat') and getattr(x.dtype, 'hasobject', False):
+            idx, scale = pick(x.size)
+            flat = x.reshape(-1)
+            return [ (flat[i], f'{path}.flat[{i}]') for i in idx ], scale
+        if isinstance(x, type) or type(x).__name__ in ('module', 'function', 'builtin_function_or_method', 'method'): return [], 1.0
+        children = []
+        if hasattr(x, '__dict__'): children.append((vars(x), f'{path}.__dict__'))
+        for klass in type(x).__mro__:
+            for slot in getattr(klass, '__slots__', ()):
+                if slot in ('__dict__', '__weakref__'): continue
+                if hasattr(x, slot): children.append((getattr(x, slot), f'{path}.{slot}'))
+        return children, 1.0
+
+    @staticmethod
+    def sizeof(x:Any, top:int=0, sample:Union[None, int]=None, name:str='x') -> dict:
+        r""" Estimates the deep memory footprint (retained size in bytes) of an object by traversing everything it refers to.
+
+        :param x:       the object to measure
+        :param top:     no of largest paths (by size of sub-tree) to report
+        :param sample:  if provided, containers with more items than this are measured on these many (evenly spaced) items 
+                        and the result is scaled up, which keeps it fast on huge object graphs (the result becomes an estimate)
+        :param name:    name of the root object used in paths
+
+        :returns: a dict with keys ``total`` (bytes), ``count`` (objects visited), ``by_type`` (bytes per type name, largest first), 
+            ``top`` (list of ``(path, bytes)``) and ``sampled`` (`True` if any container was sampled)
+
+        .. note:: Traversal is cycle-safe and every object is counted once. 
+            Data buffers shared between ndarrays (views, see ``ndarray.base``) or tensors (same storage) are also counted once.
+            Classes, modules and functions are not traversed.
+        """
+        seen, buffers = set(), set()
+        by_type = {}
+        sizes, parents, paths = [], [], []
+        sampled = False
+        stack = [(x, name, -1, 1.0)]
+        while stack:
+            obj, path, parent, weight = stack.pop()
+            if id(obj) in seen: continue
+            seen.add(id(obj))
+            buffer = __class__._buffer_(obj)
+            if buffer is None: size = getsizeof(obj)
+            else:
+                key, nbytes, size = buffer
+                if key not in buffers:
+                    buffers.add(key)
+                    size += nbytes
+            size = size * weight
+            tname = type(obj).__name__
+            by_type[tname] = by_type.get(tname, 0) + size
+            node = len(sizes)
+            sizes.append(size)
+            parents.append(parent)
+            if top: paths.append(path)
+            children, scale = __class__._children_(obj, path, sample)
+            if scale != 1.0: sampled = True
+            for c in reversed(children): stack.append((c[0], c[1], node, weight*scale))
+        total = sum(sizes)
+        res = dict(total=round(total), count=len(sizes), by_type=dict(sorted(((k, round(v)) for k,v in by_type.items()), key=lambda kv: -kv[1])), top=[], sampled=sampled)
+        if top:
+            subtree = list(sizes) # children are always discovered after their parents
+            for i in range(len(subtree)-1, 0, -1): subtree[parents[i]] += subtree[i]
+            order = sorted(range(1, len(subtree)), key=lambda i: -subtree[i])[:top]
+            res['top'] = [ (paths[i], round(subtree[i])) for i in order ]
+        return res
+
+    @staticmethod
+    def info(x:Any, show_object:bool=False, deep:bool=False, top:int=0, sample:Union[None, int]=None):
         r""" Shows the `type`, `length` and `shape` of an object and optionally shows the object as well.
 
         :param x:           the object to get info about
         :param show_object: if `True`, prints the object itself
+        :param deep:        if `True`, prints the deep memory footprint and its breakdown by type, see :func:`~known.basic.Verbose.sizeof`
+        :param top:         no of largest paths to print when ``deep`` is `True`
+        :param sample:      sampling size passed to :func:`~known.basic.Verbose.sizeof`
 
         .. note:: This is used to check output of some functions without having to print the full output
             which may take up a lot of console space. Useful when the object are of nested types.
@@ -322,23 +1592,254 @@ class Verbose:
             print(f'len: {len(x)}')
         if hasattr(x, 'shape'):
             print(f'shape: {x.shape}')
+        if deep:
+            res = __class__.sizeof(x, top=top, sample=sample)
+            print(f'size: {"~" if res["sampled"] else ""}{HRsizes.tostr(res["total"])} in {res["count"]} objects')
+            for k,v in res['by_type'].items(): print(f'\t{k}: {HRsizes.tostr(v)}')
+            for p,v in res['top']: print(f'\t@ {p}: {HRsizes.tostr(v)}')
         if show_object:
             print(f'object:\n{x}')
 
     @staticmethod
-    def infos(X:Iterable, show_object=False):
+    def infos(X:Iterable, show_object=False, deep:bool=False, top:int=0, sample:Union[None, int]=None):
         r""" Shows the `type`, `length` and `shape` of each object in an iterable 
         and optionally shows the object as well.
 
         :param x:           the object to get info about
         :param show_object: if `True`, prints the object itself
+        :param deep:        if `True`, prints the deep memory footprint, see :func:`~known.basic.Verbose.info`
 
         .. seealso::
             :func:`~known.basic.Verbose.info`
         """
         for t,x in enumerate(X):
             print(f'[# {t}]')
-            __class__.info(x, show_object=show_object)
+            __class__.info(x, show_object=show_object, deep=deep, top=top, sample=sample)
+
+    #-------------------------------------------------------------------------------
+    # instrumentation - timers, counters and histograms in a process-wide registry
+    #-------------------------------------------------------------------------------
+
+    METRICS_ENABLED = True
+    r""" If `False`, timers, counters and histograms do nothing - see :func:`~known.basic.Verbose.enable` """
+
+    METRICS_SAMPLES = 4096
+    r""" Max no of samples kept per histogram (reservoir sampled) for percentiles """
+
+    class _Hist:
+        # running count/total/min/max and a bounded reservoir of samples for percentiles
+        __slots__ = ('count', 'total', 'min', 'max', 'samples', 'cap')
+        rng = random.Random() # for reservoir sampling
+        def __init__(self, cap:int) -> None:
+            self.count, self.total, self.min, self.max, self.samples, self.cap = 0, 0, None, None, [], cap
+        def add(self, v) -> None:
+            self.count += 1
+            self.total += v
+            if self.min is None or v < self.min: self.min = v
+            if self.max is None or v > self.max: self.max = v
+            if len(self.samples) < self.cap: self.samples.append(v)
+            else:
+                j = __class__.rng.randrange(self.count)
+                if j < self.cap: self.samples[j] = v
+        def summary(self, percentiles:Iterable) -> dict:
+            res = dict(count=self.count, total=self.total, min=self.min, max=self.max, mean=(self.total/self.count if self.count else None))
+            ordered = sorted(self.samples)
+            for p in percentiles: 
+                res[f'p{p}'] = (ordered[min(len(ordered)-1, max(0, ceil(p/100*len(ordered))-1))] if ordered else None)
+            return res
+
+    _metrics_lock = threading.Lock()
+    _counters = {}
+    _hists = {}
+
+    class _NoTimer:
+        # shared no-op timer returned when metrics are disabled
+        __slots__ = ()
+        elapsed = 0
+        def __enter__(self): return self
+        def __exit__(self, *exc): return False
+
+    _NO_TIMER = _NoTimer()
+
+    class _Timer:
+        # context manager that records elapsed nanoseconds into a histogram
+        __slots__ = ('name', 'start', 'elapsed')
+        def __init__(self, name:str) -> None: self.name, self.start, self.elapsed = name, 0, 0
+        def __enter__(self): 
+            self.start = perf_counter_ns()
+            return self
+        def __exit__(self, *exc): 
+            self.elapsed = perf_counter_ns() - self.start
+            Verbose.observe(self.name, self.elapsed)
+            return False
+
+    @staticmethod
+    def enable(enabled:bool=True) -> None:
+        r""" Enables (or disables if ``enabled`` is `False`) timers, counters and histograms """
+        __class__.METRICS_ENABLED = bool(enabled)
+
+    @staticmethod
+    def disable() -> None:
+        r""" Disables timers, counters and histograms, calls to them return immediately """
+        __class__.METRICS_ENABLED = False
+
+    @staticmethod
+    def timer(name:str):
+        r""" Returns a context manager that records the elapsed time (in nanoseconds, using ``perf_counter_ns``) into the histogram ``name``.
+        The elapsed time is also available as ``elapsed`` on the returned object (always `0` when disabled).
+
+        .. code-block:: python
+
+            with Verbose.timer('load'):
+                data = Kio.load_file('data.pkl')
+        """
+        return __class__._Timer(name) if __class__.METRICS_ENABLED else __class__._NO_TIMER
+
+    @staticmethod
+    def timed(name:Union[None, str]=None) -> Callable:
+        r""" Decorator that records the time taken by each call of a function into the histogram ``name`` (defaults to function's qualified name).
+        
+        .. code-block:: python
+
+            @Verbose.timed()
+            def step(x): ...
+        """
+        def decorator(func):
+            key = func.__qualname__ if name is None else name
+            def wrapped(*args, **kwargs):
+                if not Verbose.METRICS_ENABLED: return func(*args, **kwargs)
+                start = perf_counter_ns()
+                try: return func(*args, **kwargs)
+                finally: Verbose.observe(key, perf_counter_ns() - start)
+            wrapped.__name__, wrapped.__qualname__, wrapped.__doc__, wrapped.__wrapped__ = func.__name__, func.__qualname__, func.__doc__, func
+            return wrapped
+        return decorator
+
+    @staticmethod
+    def count(name:str, n:int=1) -> None:
+        r""" Increments the counter ``name`` by ``n`` """
+        if not __class__.METRICS_ENABLED: return
+        with __class__._metrics_lock: __class__._counters[name] = __class__._counters.get(name, 0) + n
+
+    @staticmethod
+    def observe(name:str, value) -> None:
+        r""" Adds a value to the histogram ``name`` """
+        if not __class__.METRICS_ENABLED: return
+        with __class__._metrics_lock:
+            h = __class__._hists.get(name, None)
+            if h is None: h = __class__._hists[name] = __class__._Hist(__class__.METRICS_SAMPLES)
+            h.add(value)
+
+    @staticmethod
+    def metrics(percentiles:Iterable=(50, 90, 99), as_json:bool=False, indent:Union[None, int]=None) -> Union[dict, str]:
+        r""" Returns a snapshot of all counters and histogram summaries (count, total, min, max, mean and percentiles).
+
+        :param percentiles: percentiles to compute from the samples of each histogram
+        :param as_json:     if `True`, returns a json string instead of a dict
+        :param indent:      indent for json string
+
+        .. note:: Timer histograms are in nanoseconds. Percentiles are computed over at most ``METRICS_SAMPLES`` samples per histogram.
+        """
+        with __class__._metrics_lock:
+            res = dict(
+                counters = dict(__class__._counters),
+                histograms = { k:h.summary(percentiles) for k,h in __class__._hists.items() },
+            )
+        return json.dumps(res, indent=indent) if as_json else res
+
+    @staticmethod
+    def reset_metrics(name:Union[None, str]=None) -> None:
+        r""" Clears all counters and histograms, or only those with key ``name`` """
+        with __class__._metrics_lock:
+            if name is None: 
+                __class__._counters.clear()
+                __class__._hists.clear()
+            else:
+                __class__._counters.pop(name, None)
+                __class__._hists.pop(name, None)
+
+#=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class UidGen:
+    r""" 
+    Generates unique identifiers based on current timestamp - same format as :func:`~known.basic.Verbose.strU` 
+    followed by process id and a sequence number, like ``start + timestamp + tag + pid + tag + seq + end``.
+
+    :param form:    the format of timestamp, If `None`, uses the default :data:`~known.basic.Verbose.DEFAULT_DATE_FORMAT`.
+        Can be selected from a sub-set of ``["%Y","%m","%d","%H","%M","%S","%f"]``.
+    :param start:   UID prefix
+    :param sep:     timestamp seperator
+    :param end:     UID postfix
+    :param tag:     seperator before process id and sequence number
+
+    .. code-block:: python
+
+        uid = UidGen(sep='_')
+        names = [ f'{uid()}.pkl' for _ in range(1000) ]   # all unique
+        names = uid.batch(1000)                         # same but faster
+
+    .. note:: 
+        The formatted timestamp is cached and re-formatted only once per second (microseconds are filled in directly).
+        The sequence number is shared by all instances, monotonic within a process and thread-safe (no locks on the hot path), 
+        the process id keeps UIDs from different processes apart and the sequence restarts in forked children.
+    """
+
+    def __init__(self, form:Union[None, Iterable[str]]=None, start:str='', sep:str='', end:str='', tag:str='_') -> None:
+        self.form = tuple(form) if form else tuple(Verbose.DEFAULT_DATE_FORMAT)
+        assert self.form, 'format should not be empty!'
+        self.start, self.sep, self.end, self.tag = start, sep, end, tag
+        # split the format at microseconds, parts are formatted once per second
+        self.parts = sep.join(self.form).split('%f')
+        self.micro = len(self.parts) > 1
+        self.lock = threading.Lock()
+        self.cache = (None, None) # (second, stamp) - replaced as a whole so that readers never see a mixed pair
+        self._reset_()
+        __class__._live.add(self)
+
+    _live = WeakSet()
+    _seq = count() # shared by all instances so that two generators with the same format never repeat a UID
+
+    @staticmethod
+    def _after_fork_() -> None:
+        # restarts sequence and updates pid of all generators in a forked child
+        __class__._seq = count()
+        for gen in list(__class__._live): gen._reset_()
+
+    def _reset_(self) -> None:
+        self.pid = os.getpid()
+        self.suffix = f'{self.tag}{self.pid}{self.tag}'
+
+    def _stamp_(self, second:int) -> Union[str, list]:
+        # formats the per-second parts of the timestamp
+        with self.lock:
+            if second != self.cache[0]:
+                tm = localtime(second)
+                parts = [ strftime(p, tm) for p in self.parts ]
+                parts[0] = self.start + parts[0]
+                self.cache = (second, (parts if self.micro else parts[0]))
+            return self.cache[1]
+
+    def _render_(self, ns:int) -> str:
+        # timestamp string for given time (in ns since epoch)
+        second = ns // 1_000_000_000
+        cached, stamp = self.cache
+        if second != cached: stamp = self._stamp_(second)
+        return f'{(ns // 1000) % 1_000_000:06d}'.join(stamp) if self.micro else stamp
+
+    def __call__(self) -> str:
+        r""" Returns a new UID """
+        return f'{self._render_(time_ns())}{self.suffix}{next(__class__._seq)}{self.end}'
+
+    def batch(self, n:int) -> list:
+        r""" Returns a list of ``n`` new UIDs (sharing the same timestamp) """
+        head = f'{self._render_(time_ns())}{self.suffix}'
+        seq, end = __class__._seq, self.end
+        return [ f'{head}{next(seq)}{end}' for _ in range(n) ]
+
+    def __iter__(self): 
+        while True: yield self()
+
+if hasattr(os, 'register_at_fork'): os.register_at_fork(after_in_child=UidGen._after_fork_)
 
 #=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
 
@@ -348,36 +1849,184 @@ class Remap:
 
     :param Input_Range:     *FROM* range for ``forward`` call, *TO* range for ``backward`` call
     :param Output_Range:    *TO* range for ``forward`` call, *FROM* range for ``forward`` call
+
+    :param axis:            if ranges are arrays (one value per channel), the axis of ``X`` along which they are broadcasted, 
+                            if `None`, usual broadcasting rules apply (i.e. along the last axis)
+
+    .. note:: the mapping is computed as ``((X - low)*to_delta/from_delta) + to_low`` for scalars, ndarrays and tensors alike, 
+        integer ndarrays and tensors are mapped in floating point. For ndarrays and tensors, use ``out=`` or ``inplace=True`` to avoid allocating temporaries.
+
+    .. note:: the low and high of a range can be scalars or arrays (lists or tuples are converted to ndarrays), 
+        use :func:`~known.basic.Remap.fit_stream` to estimate input range from data in one pass.
     """
 
-    def __init__(self, Input_Range:tuple, Output_Range:tuple) -> None:
+    def __init__(self, Input_Range:tuple, Output_Range:tuple, axis:Union[None, int]=None) -> None:
         r"""
         :param Input_Range:     `from` range for ``i2o`` call, `to` range for ``o2i`` call
         :param Output_Range:    `to` range for ``i2o`` call, `from` range for ``o2i`` call
         """
+        self.axis = axis
         self.set_input_range(Input_Range)
         self.set_output_range(Output_Range)
 
+    @staticmethod
+    def _value_(v):
+        # converts per-channel values given as list or tuple to ndarray
+        if isinstance(v, (list, tuple)):
+            import numpy as np
+            return np.asarray(v, dtype=np.float64)
+        return v
+
     def set_input_range(self, Range:tuple) -> None:
         r""" set the input range """
-        self.input_low, self.input_high = Range
+        self.input_low, self.input_high = map(__class__._value_, Range)
         self.input_delta = self.input_high - self.input_low
+        self._update_()
 
     def set_output_range(self, Range:tuple) -> None:
         r""" set the output range """
-        self.output_low, self.output_high = Range
+        self.output_low, self.output_high = map(__class__._value_, Range)
         self.output_delta = self.output_high - self.output_low
+        self._update_()
+
+    def _broadcast_(self, v, X):
+        # reshapes a per-channel array to broadcast along self.axis of X and converts it to tensor if X is a tensor
+        if getattr(v, 'ndim', 0) == 0: return v
+        if self.axis is not None:
+            shape = [1 for _ in range(X.ndim)]
+            shape[self.axis] = -1
+            v = v.reshape(shape)
+        return X.new_tensor(v) if hasattr(X, 'new_tensor') else v
+
+    @staticmethod
+    def fit_stream(chunks:Iterable, axis:Union[None, int]=None, Output_Range:tuple=(0., 1.)) -> 'Remap':
+        r""" creates a Remap with input range estimated from data in a single pass, only one chunk is held in memory at a time
 
-    def backward(self, X):
-        r""" maps ``X`` from ``Output_Range`` to ``Input_Range`` """
-        return ((X - self.output_low)*self.input_delta/self.output_delta) + self.input_low
+        :param chunks:          iterable of ndarrays (or array-likes) with same number of channels along ``axis``
+        :param axis:            channel axis - min/max are computed per channel over all other axes, if `None`, a global (scalar) min/max is computed
+        :param Output_Range:    output range of the created Remap
+        """
+        import numpy as np
+        low, high = None, None
+        for c in chunks:
+            c = np.asarray(c)
+            reduce = None if axis is None else tuple(i for i in range(c.ndim) if i != axis % c.ndim)
+            cl, ch = c.min(axis=reduce), c.max(axis=reduce)
+            low, high = (cl, ch) if low is None else (np.minimum(low, cl), np.maximum(high, ch))
+        assert low is not None, f'no data in chunks'
+        return __class__((low.astype(np.float64), high.astype(np.float64)), Output_Range, axis)
+
+    def _update_(self) -> None:
+        # called when a range changes - lookup tables are no longer valid
+        # a direction whose source range is empty (zero delta) can not be mapped, it raises when used instead of on construction
+        self.luts = {}
+        if not (hasattr(self, 'input_delta') and hasattr(self, 'output_delta')): return
+        self.forward_valid = not __class__._is_zero_(self.input_delta)
+        self.backward_valid = not __class__._is_zero_(self.output_delta)
+
+    @staticmethod
+    def _is_zero_(delta) -> bool:
+        # checks if a range delta (scalar or per-channel) is zero anywhere
+        return bool((delta == 0).any()) if getattr(delta, 'ndim', 0) > 0 else bool(delta == 0)
 
-    def forward(self, X):
-        r""" maps ``X`` from ``Input_Range`` to ``Output_Range`` """
-        return ((X - self.input_low)*self.output_delta/self.input_delta) + self.output_low
+    @staticmethod
+    def _check_valid_(valid:bool, name:str) -> None:
+        if not valid: raise ZeroDivisionError(f'cannot map from an empty range in {name}, low and high are equal')
 
-    def __call__(self, X, backward=False):
-        return self.backward(X) if backward else self.forward(X)
+    @staticmethod
+    def _apply_(X, src_low, src_delta, dst_low, dst_delta, out=None, inplace=False):
+        # computes ((X - src_low)*dst_delta/src_delta) + dst_low - same order of operations as scalars, so that range endpoints map exactly
+        # ndarrays and tensors use a single temporary, with out (or inplace) no temporaries are created
+        if inplace: out = X
+        if out is None:
+            if hasattr(X, 'sub_'): # tensor
+                if not X.is_floating_point(): X = X.float()
+                return X.sub(src_low).mul_(dst_delta).div_(src_delta).add_(dst_low)
+            if hasattr(X, '__array_ufunc__'): # ndarray
+                import numpy as np
+                Y = np.subtract(X, src_low, dtype=(None if X.dtype.kind in 'fc' else np.float64))
+                Y *= dst_delta
+                Y /= src_delta
+                Y += dst_low
+                return Y
+            return ((X - src_low)*dst_delta/src_delta) + dst_low
+        if hasattr(out, 'sub_'): # tensor
+            if out is not X: out.copy_(X)
+            return out.sub_(src_low).mul_(dst_delta).div_(src_delta).add_(dst_low)
+        import numpy as np
+        np.subtract(X, src_low, out=out)
+        np.multiply(out, dst_delta, out=out)
+        np.divide(out, src_delta, out=out)
+        return np.add(out, dst_low, out=out)
+
+    def backward(self, X, out=None, inplace:bool=False):
+        r""" maps ``X`` from ``Output_Range`` to ``Input_Range`` 
+        
+        :param out:     ndarray or tensor to write the result into (should have a floating dtype)
+        :param inplace: if `True`, overwrites ``X`` with the result
+        """
+        __class__._check_valid_(self.backward_valid, 'backward')
+        b = self._broadcast_
+        return __class__._apply_(X, b(self.output_low, X), b(self.output_delta, X), b(self.input_low, X), b(self.input_delta, X), out, inplace)
+
+    def forward(self, X, out=None, inplace:bool=False):
+        r""" maps ``X`` from ``Input_Range`` to ``Output_Range``, see :func:`~known.basic.Remap.backward` for ``out`` and ``inplace`` """
+        __class__._check_valid_(self.forward_valid, 'forward')
+        b = self._broadcast_
+        return __class__._apply_(X, b(self.input_low, X), b(self.input_delta, X), b(self.output_low, X), b(self.output_delta, X), out, inplace)
+
+    ROUNDING = ('round', 'floor', 'ceil', 'trunc')
+    r""" Rounding policies for lookup tables with integer output dtype, see :func:`~known.basic.Remap.lut` """
+
+    def lut(self, dtype_in='uint8', dtype_out='float32', rounding:Union[None, str]='round', clip:bool=True, backward:bool=False):
+        r""" returns a (cached) lookup table that maps every value of a small integer dtype through the remap
+
+        :param dtype_in:    input dtype - 8 or 16 bit integers (signed or unsigned), table is indexed by the unsigned bit pattern
+        :param dtype_out:   output dtype of table
+        :param rounding:    for integer ``dtype_out`` - one of :data:`~known.basic.Remap.ROUNDING` or `None` to truncate while casting
+        :param clip:        for integer ``dtype_out`` - if `True`, clips to the range of ``dtype_out`` instead of wrapping around
+        :param backward:    if `True`, table is for ``backward`` mapping
+        """
+        import numpy as np
+        __class__._check_valid_(self.backward_valid if backward else self.forward_valid, 'backward' if backward else 'forward')
+        assert all(np.ndim(v) == 0 for v in (self.input_low, self.input_high, self.output_low, self.output_high)), f'lookup tables require scalar ranges'
+        di, do = np.dtype(dtype_in), np.dtype(dtype_out)
+        key = (di, do, rounding, clip, backward)
+        table = self.luts.get(key, None)
+        if table is None:
+            assert di.kind in 'iu' and di.itemsize<=2, f'lookup tables are only for 8 or 16 bit integers, got {di}'
+            domain = np.arange(2**(8*di.itemsize), dtype=f'u{di.itemsize}').view(di).astype(np.float64)
+            y = self.backward(domain, inplace=True) if backward else self.forward(domain, inplace=True)
+            if do.kind in 'iu':
+                if rounding: 
+                    assert rounding in __class__.ROUNDING, f'rounding should be in {__class__.ROUNDING}, got {rounding}'
+                    getattr(np, rounding)(y, out=y)
+                if clip: np.clip(y, np.iinfo(do).min, np.iinfo(do).max, out=y)
+            table = y.astype(do)
+            table.setflags(write=False)
+            self.luts[key] = table
+        return table
+
+    def forward_lut(self, X, dtype_out='float32', rounding:Union[None, str]='round', clip:bool=True, out=None):
+        r""" maps an 8 or 16 bit integer ndarray ``X`` (like images) using a single gather from a lookup table,
+        see :func:`~known.basic.Remap.lut` for other arguments 
+        
+        :param out: ndarray (of ``dtype_out``) to write the result into
+        """
+        import numpy as np
+        table = self.lut(X.dtype, dtype_out, rounding, clip, False)
+        if X.dtype.kind=='i': X = X.view(f'u{X.dtype.itemsize}')
+        return table[X] if out is None else np.take(table, X, out=out, mode='clip')
+
+    def backward_lut(self, X, dtype_out='float32', rounding:Union[None, str]='round', clip:bool=True, out=None):
+        r""" same as :func:`~known.basic.Remap.forward_lut` for ``backward`` mapping """
+        import numpy as np
+        table = self.lut(X.dtype, dtype_out, rounding, clip, True)
+        if X.dtype.kind=='i': X = X.view(f'u{X.dtype.itemsize}')
+        return table[X] if out is None else np.take(table, X, out=out, mode='clip')
+
+    def __call__(self, X, backward=False, out=None, inplace:bool=False):
+        return self.backward(X, out, inplace) if backward else self.forward(X, out, inplace)
     
     def swap_range(self):
         Input_Range, Output_Range = (self.output_low, self.output_high), (self.input_low, self.input_high)
@@ -415,18 +2064,8 @@ class BaseConvert:
 
         digits_from =  [int(abs(d)) for d in digits] # convert to int data-type
         if reversed: digits_from = digits_from[::-1]
-        ndigits_from = len(digits_from)
-        mult_from = [base_from**i for i in range(ndigits_from)]
-        repr_from = sum([ui*vi for ui,vi in zip(digits_from,mult_from, strict=True)]) #dot(digits_from , mult_from)
-
-        #ndc = base_from**ndigits_from
-        ndigits_to = ceil(log(repr_from,base_to))
-        digits_to =  __class__.zeros(ndigits_to) 
-        n = int(repr_from)
-        for d in range(ndigits_to):
-            digits_to[d] = n%base_to
-            n=n//base_to
-
+        repr_from = __class__.base2int(digits_from, base_from)
+        digits_to = __class__.int2base(repr_from, base_to, __class__.ndigits_exact(repr_from, base_to))
         if reversed: digits_to = digits_to[::-1]
         return tuple(digits_to)
 
@@ -434,6 +2073,69 @@ class BaseConvert:
     @staticmethod
     def ndigits(num:int, base:int): return ceil(log(num,base))
 
+    @staticmethod
+    def ndigits_exact(num:int, base:int) -> int:
+        r""" exact no of digits required to represent a non-negative integer ``num`` in base-n (at least 1), uses integer arithmetic only """
+        num = int(num) # numpy integers have no bit_length
+        if num < base: return 1
+        d = max(1, int((num.bit_length()-1) / log(base, 2))) # estimate from bit length, may be off by one due to floats
+        p = base**d
+        while p > num: 
+            p //= base
+            d -= 1
+        while p <= num: 
+            p *= base
+            d += 1
+        return d
+
+    DC_THRESHOLD = 512
+    r""" :func:`~known.basic.BaseConvert.int2base` and :func:`~known.basic.BaseConvert.base2int` switch to divide-and-conquer above this many digits """
+
+    DC_LEAF = 32
+    r""" no of digits converted by simple loops at the leaves of divide-and-conquer """
+
+    @staticmethod
+    def int2base_dc(num:int, base:int, digs:Union[None, int]=None) -> list:
+        r""" Divide-and-conquer version of :func:`~known.basic.BaseConvert.int2base` for huge integers.
+        The number is split recursively by precomputed powers ``base**(leaf * 2**k)`` so that
+        most of the work is done by a few large multiplications and divisions instead of one division per digit.
+        """
+        ndigits = digs if digs else __class__.ndigits_exact(num, base)
+        leaf = __class__.DC_LEAF
+        pows = [base**leaf] # pows[k] = base**(leaf * 2**k)
+        while leaf * 2**len(pows) < ndigits: pows.append(pows[-1]*pows[-1])
+        if num >= pows[-1]*pows[-1]: num %= base**ndigits # drop higher digits, same as int2base
+        digits = []
+        def split(n, k): # appends exactly leaf * 2**k digits of n
+            if n == 0: digits.extend(__class__.zeros(leaf * 2**k))
+            elif k == 0:
+                for _ in range(leaf): 
+                    n, r = divmod(n, base)
+                    digits.append(r)
+            else:
+                hi, lo = divmod(n, pows[k-1])
+                split(lo, k-1)
+                split(hi, k-1)
+        split(num, len(pows))
+        return digits[:ndigits]
+
+    @staticmethod
+    def base2int_dc(num:Iterable, base:int) -> int:
+        r""" Divide-and-conquer version of :func:`~known.basic.BaseConvert.base2int` for huge integers,
+        chunks of digits are combined pairwise using powers ``base**(leaf * 2**k)`` """
+        num, leaf = list(num), __class__.DC_LEAF
+        values = []
+        for i in range(0, len(num), leaf):
+            v = 0
+            for n in num[i:i+leaf][::-1]: v = v*base + n
+            values.append(v)
+        m = base**leaf
+        while len(values) > 1:
+            if len(values) % 2: values.append(0)
+            values = [ values[i] + values[i+1]*m for i in range(0, len(values), 2) ]
+            m *= m
+        return int(values[0]) if values else 0
+
     @staticmethod
     def int2base(num:int, base:int, digs:int) -> list:
         r""" 
@@ -449,7 +2151,8 @@ class BaseConvert:
             :func:`~known.basic.base2int`
         """
         
-        ndigits = digs if digs else ceil(log(num,base)) 
+        ndigits = digs if digs else __class__.ndigits_exact(num, base)
+        if ndigits > __class__.DC_THRESHOLD: return __class__.int2base_dc(num, base, ndigits)
         digits =  __class__.zeros(ndigits)
         n = num
         for d in range(ndigits):
@@ -470,6 +2173,8 @@ class BaseConvert:
         .. seealso::
             :func:`~known.basic.int2base`
         """
+        if not isinstance(num, (list, tuple)): num = list(num)
+        if len(num) > __class__.DC_THRESHOLD: return __class__.base2int_dc(num, base)
         res = 0
         for i,n in enumerate(num): res+=(base**i)*n
         return int(res)
@@ -493,7 +2198,7 @@ class BaseConvert:
     def from_base_10(syms:dict, num:int, joiner='', ndigs=None):
         base = len(syms)
         #print(f'----{num=} {type(num)}, {base=}, {type(base)}')
-        if not ndigs: ndigs = (1 + (0 if num==0 else floor(log(num, base))))  # __class__.ndigs(num, base)
+        if not ndigs: ndigs = __class__.ndigits_exact(num, base)
         ss = tuple(syms.keys())
         S = [ ss[i]  for i in __class__.int2base(num, base, ndigs) ]
         return joiner.join(S[::-1])
@@ -501,11 +2206,298 @@ class BaseConvert:
 
     @staticmethod
     def int2hex(num:int, joiner=''): return __class__.from_base_10(__class__.SYM_HEX, num, joiner)
+
+    # vectorized (numpy) versions for converting many numbers at once
+
+    POWERS = {}
+    r""" Cache of power tables ``(base, digs) -> int64 ndarray`` used by array methods """
+
+    @staticmethod
+    def powers(base:int, digs:int):
+        r""" returns (cached) int64 array ``[base**0, base**1, ... base**(digs-1)]`` """
+        p = __class__.POWERS.get((base, digs), None)
+        if p is None:
+            import numpy as np
+            assert base**(digs-1) < 2**63, f'{digs} digits in base {base} do not fit in int64'
+            p = np.array([base**i for i in range(digs)], dtype=np.int64)
+            p.setflags(write=False)
+            __class__.POWERS[(base, digs)] = p
+        return p
+
+    @staticmethod
+    def int2base_array(nums, base:int, digs:int):
+        r""" 
+        Vectorized :func:`~known.basic.BaseConvert.int2base` - converts an array of non-negative base-10 integers to a digit matrix
+
+        :param nums:    array-like of ``N`` integers (int64)
+        :param base:    base-n number system
+        :param digs:    no of digits in the output
+
+        :returns:       int64 ndarray of shape ``(N, digs)``, column ``i`` holds the digit for ``base**i`` (same order as ``int2base``)
+        """
+        import numpy as np
+        nums = np.asarray(nums, dtype=np.int64)
+        if base & (base-1) == 0: # power of 2, use shifts and masks
+            return (nums[..., None] >> ((base.bit_length()-1) * np.arange(digs))) & (base-1)
+        digits = np.empty((digs, *nums.shape), dtype=np.int64) # one divmod per digit, each writes a contiguous row
+        for i in range(digs): nums, digits[i] = np.divmod(nums, base)
+        return np.moveaxis(digits, 0, -1)
+
+    @staticmethod
+    def base2int_array(digits, base:int):
+        r""" Vectorized :func:`~known.basic.BaseConvert.base2int` - converts a digit matrix of shape ``(N, digs)`` to an int64 array of ``N`` integers """
+        import numpy as np
+        digits = np.asarray(digits, dtype=np.int64)
+        return digits @ __class__.powers(base, digits.shape[-1])
+
+    @staticmethod
+    def from_base_10_array(syms:dict, nums, ndigs:int, joiner:str=''):
+        r""" Vectorized :func:`~known.basic.BaseConvert.from_base_10` - converts an array of integers to an array of fixed-width strings 
+
+        :param joiner:  string placed between symbols (same as in :func:`~known.basic.BaseConvert.from_base_10`)
+
+        .. note:: if all symbols are single characters and ``joiner`` is empty, strings are created without a python loop
+        """
+        import numpy as np
+        digits = __class__.int2base_array(nums, len(syms), ndigs)[..., ::-1]
+        if not joiner and all(len(k)==1 for k in syms): # gather unicode code points and view them as strings
+            codes = np.array([ord(k) for k in syms], dtype=np.int32)
+            return np.ascontiguousarray(codes[digits]).view(f'<U{ndigs}')[..., 0]
+        table = np.array(tuple(syms.keys()))
+        return np.array([joiner.join(row) for row in table[digits].reshape(-1, ndigs)]).reshape(digits.shape[:-1])
+
+    @staticmethod
+    def to_base_10_array(syms:dict, nums):
+        r""" Vectorized :func:`~known.basic.BaseConvert.to_base_10` - converts an array of equal length strings (single-char symbols) to an int64 array """
+        import numpy as np
+        nums = np.asarray(nums, dtype=str)
+        ndigs = nums.dtype.itemsize // np.dtype('<U1').itemsize
+        codes = np.ascontiguousarray(nums).view(np.int32).reshape(*nums.shape, ndigs)[..., ::-1] # unicode code points
+        lut = np.full(max(ord(k) for k in syms)+1, -1, dtype=np.int64)
+        for k,v in syms.items(): lut[ord(k)] = v
+        digits = lut[np.minimum(codes, len(lut)-1)]
+        assert (digits>=0).all() and (codes<len(lut)).all(), f'unknown symbols in input'
+        return __class__.base2int_array(digits, len(syms))
+
+    # mixed-radix numbers (each position has its own base)
+
+    STRIDES = {}
+    r""" Cache of stride tables ``(radices, order) -> tuple`` used by :func:`~known.basic.BaseConvert.ravel` and :func:`~known.basic.BaseConvert.unravel` """
+
+    @staticmethod
+    def strides(radices:tuple, order:str='C') -> tuple:
+        r""" returns (cached) multipliers of each position for a tuple of radices 
+
+        :param order:   ``'C'`` - last position changes fastest (like ``numpy.ravel_multi_index``), 
+                        ``'F'`` - first position changes fastest (like digits of :func:`~known.basic.BaseConvert.int2base`)
+        """
+        key = (radices, order)
+        s = __class__.STRIDES.get(key, None)
+        if s is None:
+            assert order in ('C', 'F'), f'order should be C or F, got {order}'
+            s, m = [], 1
+            for r in (reversed(radices) if order=='C' else radices):
+                s.append(m)
+                m *= r
+            s = tuple(reversed(s)) if order=='C' else tuple(s)
+            __class__.STRIDES[key] = s
+        return s
+
+    @staticmethod
+    def ravel(digits:Iterable, radices:tuple, order:str='C'):
+        r""" Mixed-radix encode - converts digits (one per position) to a single integer, like ``numpy.ravel_multi_index`` but for any radices.
+
+        :param digits:  iterable of digits, each can be an int or an ndarray (broadcasted)
+        :param radices: tuple of bases, one for each position (should be hashable for caching strides)
+        :param order:   see :func:`~known.basic.BaseConvert.strides`
+
+        .. note:: digits are not checked against radices, use :func:`~known.basic.BaseConvert.check_digits` if required
+        """
+        res = 0
+        for d,s in zip(digits, __class__.strides(tuple(radices), order), strict=True): res = res + d*s
+        return res
+
+    @staticmethod
+    def unravel(num, radices:tuple, order:str='C') -> tuple:
+        r""" Mixed-radix decode - converts an integer (or an ndarray of integers) to a tuple of digits, inverse of :func:`~known.basic.BaseConvert.ravel` """
+        radices = tuple(radices)
+        return tuple( (num // s) % r for s,r in zip(__class__.strides(radices, order), radices) )
+
+    @staticmethod
+    def check_digits(digits:Iterable, radices:tuple) -> bool:
+        r""" checks that each digit (or each element of each ndarray) is in range ``[0, radix)`` """
+        return all( bool(((0 <= d) & (d < r)).all()) if hasattr(d, 'all') else (0 <= d < r) for d,r in zip(digits, radices, strict=True) )
+
+    @staticmethod
+    def ravel_syms(symbols:Iterable, tables:tuple, order:str='C'):
+        r""" Mixed-radix encode using a symbol dict per position (radix of a position is the size of its dict) 
+
+        :param symbols:  iterable of symbols (one per position), each can be a symbol or an ndarray of symbols
+        :param tables:   tuple of symbol dicts like :data:`~known.basic.BaseConvert.SYM_HEX`
+        """
+        digits = []
+        for x,t in zip(symbols, tables, strict=True):
+            if hasattr(x, 'shape'):
+                import numpy as np
+                keys, inverse = np.unique(x, return_inverse=True)
+                x = np.array([t[k] for k in keys.tolist()], dtype=np.int64)[inverse.reshape(x.shape)]
+            else: x = t[x]
+            digits.append(x)
+        return __class__.ravel(digits, tuple(len(t) for t in tables), order)
+
+    @staticmethod
+    def unravel_syms(num, tables:tuple, order:str='C') -> tuple:
+        r""" Mixed-radix decode to a tuple of symbols (or ndarrays of symbols), inverse of :func:`~known.basic.BaseConvert.ravel_syms` """
+        res = []
+        for d,t in zip(__class__.unravel(num, tuple(len(t) for t in tables), order), tables):
+            keys = tuple(t.keys())
+            if hasattr(d, 'shape'):
+                import numpy as np
+                res.append(np.array(keys)[d])
+            else: res.append(keys[d])
+        return tuple(res)
   
 #=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
 
+class BaseCodec:
+    r""" Streaming encoder/decoder for bytes using a symbol dict (like :data:`~known.basic.BaseConvert.SYM_HEX`).
+
+    Bytes are processed in fixed size blocks - each block of ``block`` bytes is encoded as exactly ``width`` symbols 
+    (including leading zeros), the last (partial) block uses the minimum width for its length so that no padding is required.
+    If the base is a power of 2 (like hex or base64 alphabets), blocks are aligned to bit-groups and encoded using bit operations.
+
+    :param syms:    symbol dict mapping symbols to digits, same as used in :class:`~known.basic.BaseConvert`
+    :param block:   no of bytes per block, ignored for power of 2 bases, if `None`, defaults to 32
+    :param joiner:  string placed between symbols, required if symbols have more than one character (like those from ``n_syms(n)`` for n>10)
+    """
+
+    def __init__(self, syms:dict, block:Union[None, int]=None, joiner:str='') -> None:
+        self.syms, self.base, self.joiner = syms, len(syms), joiner
+        self.table = tuple(syms.keys())
+        assert self.base>1, f'need at least 2 symbols'
+        assert joiner or all(len(k)==1 for k in self.table), f'joiner is required for symbols with more than one character'
+        bits = self.base.bit_length()-1
+        self.bits = bits if (self.base == 2**bits and bits<=8) else 0 # bit-group mode
+        if self.bits:
+            self.block = (8*bits // gcd(8, bits)) // 8 # lcm(8, bits) in bytes
+            self.width = self.block*8 // bits
+            self.widths = { r : -(-8*r // bits) for r in range(1, self.block+1) }
+        else:
+            self.block = block if block else 32
+            self.widths = { r : BaseConvert.ndigits_exact(256**r - 1, self.base) for r in range(1, self.block+1) }
+            self.width = self.widths[self.block]
+        self.sizes = { w:r for r,w in self.widths.items() } # width -> no of bytes
+        assert len(self.sizes) == len(self.widths), f'block size {self.block} is ambiguous for base {self.base}, use a smaller block'
+        if self.bits and self.block == 1: # lookup tables for each byte
+            self.lookup = [ self.joiner.join(self._encode_block_(bytes([i]))) for i in range(256) ]
+            self.rlookup = { e:i for i,e in enumerate(self.lookup) }
+        else: self.lookup, self.rlookup = None, None
+
+    def _encode_block_(self, b:bytes) -> list:
+        # returns list of symbols for a block
+        n, w = int.from_bytes(b, 'big'), self.widths[len(b)]
+        if self.bits:
+            n <<= (w*self.bits - 8*len(b)) # align to bit-groups
+            mask, table = self.base-1, self.table
+            return [ table[(n >> (self.bits*i)) & mask] for i in range(w-1, -1, -1) ]
+        return [ self.table[d] for d in reversed(BaseConvert.int2base(n, self.base, w)) ]
+
+    def _decode_block_(self, symbols:list) -> bytes:
+        r = self.sizes.get(len(symbols), None)
+        if r is None: raise ValueError(f'invalid length of last block {len(symbols)}')
+        n, base, syms = 0, self.base, self.syms
+        for s in symbols: n = n*base + syms[s]
+        if self.bits: n >>= (len(symbols)*self.bits - 8*r)
+        return n.to_bytes(r, 'big') # raises OverflowError for invalid input
+
+    def encode(self, data:bytes) -> str:
+        r""" encodes all bytes to a string """
+        return ''.join(self.iter_encode(BytesIO(data)))
+
+    def decode(self, text:str) -> bytes:
+        r""" decodes a string created by :func:`~known.basic.BaseCodec.encode` """
+        from io import StringIO
+        return b''.join(self.iter_decode(StringIO(text)))
+
+    def iter_encode(self, f, blocks:int=4096):
+        r""" generator that reads a binary file-object and yields encoded strings (one per chunk of ``blocks`` blocks) """
+        size, sep = self.block*blocks, ''
+        while True:
+            chunk = f.read(size)
+            if not chunk: break
+            if self.lookup is not None: symbols = map(self.lookup.__getitem__, chunk)
+            else: symbols = ( s for i in range(0, len(chunk), self.block) for s in self._encode_block_(chunk[i:i+self.block]) )
+            yield sep + self.joiner.join(symbols)
+            sep = self.joiner
+
+    def _tokens_(self, f, size:int):
+        # reads a text file-object in chunks and yields lists of symbols
+        tail = ''
+        while True:
+            chunk = f.read(size)
+            if not chunk: break
+            if not self.joiner: 
+                yield list(chunk)
+                continue
+            tokens = (tail + chunk).split(self.joiner)
+            tail = tokens.pop() # may be incomplete
+            yield tokens
+        if tail: yield [tail]
+
+    def iter_decode(self, f, blocks:int=4096):
+        r""" generator that reads a text file-object (created by :func:`~known.basic.BaseCodec.iter_encode`) and yields decoded bytes """
+        pending, width = [], self.width
+        if self.rlookup is not None and not self.joiner: # one byte per width symbols, decode by table
+            tail, rlookup = '', self.rlookup
+            while True:
+                chunk = f.read(width*blocks)
+                if not chunk: break
+                chunk = tail + chunk
+                n = len(chunk) - len(chunk) % width
+                yield bytes( rlookup[chunk[i:i+width]] for i in range(0, n, width) )
+                tail = chunk[n:]
+            if tail: raise ValueError(f'invalid length of last block {len(tail)}')
+            return
+        for tokens in self._tokens_(f, width*blocks):
+            pending.extend(tokens)
+            n = len(pending) - len(pending) % width
+            if n: 
+                yield b''.join( self._decode_block_(pending[i:i+width]) for i in range(0, n, width) )
+                del pending[:n]
+        if pending: yield self._decode_block_(pending)
+
+#=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+def _is_bulk_(index) -> bool: 
+    # checks if an index addresses multiple positions - slice, list, range or ndarray (tuples are valid keys, hence not bulk)
+    # numpy scalars (like np.str_ keys or np.int64 positions) are 0-d hence not bulk
+    return isinstance(index, (slice, list, range)) or getattr(index, 'ndim', 0) > 0
+
+def _as_key_(name):
+    # maps numpy integer scalars to int so that they address positions, other keys are returned as they are
+    if isinstance(name, (str, int)) or getattr(name, 'ndim', None) != 0: return name
+    return operator.index(name) if getattr(name.dtype, 'kind', None) in ('i', 'u') else name
+
+def _bulk_positions_(index, n:int) -> list:
+    # converts a bulk index (slice, list/ndarray of ints or a boolean mask of length n) to a list of positions
+    if isinstance(index, slice): return range(n)[index]
+    if hasattr(index, '__array_interface__'): 
+        if index.dtype == bool: 
+            assert len(index)==n, f'mask length mismatch {len(index)} != {n}'
+            return index.nonzero()[0].tolist()
+        return index.tolist()
+    index = list(index)
+    if index and all(isinstance(i, bool) for i in index):
+        assert len(index)==n, f'mask length mismatch {len(index)} != {n}'
+        return [i for i,m in enumerate(index) if m]
+    return index
+
 class IndexedDict(UserDict):
-    r""" Implements an Indexed dict where values can be addressed using both index(int) and keys(str) """
+    r""" Implements an Indexed dict where values can be addressed using both index(int) and keys(str) 
+    
+    .. note:: multiple values can be addressed at once using a slice, a list (or ndarray) of indices or a boolean mask, 
+        see :func:`~known.basic.IndexedDict.get_at` and :func:`~known.basic.IndexedDict.update_at`
+    """
 
     def __init__(self, **members) -> None:
         self.names = []
@@ -518,18 +2510,32 @@ class IndexedDict(UserDict):
     def __len__(self): return len(self.data)
 
     def __getitem__(self, name): 
+        name = _as_key_(name)
         if isinstance(name, int): name = self.names[name]
+        elif _is_bulk_(name): return self.get_at(name)
         if name in self.data: 
             return self.data[name]
         else:
             raise KeyError(name)
 
     def __setitem__(self, name, item): 
+        name = _as_key_(name)
         if isinstance(name, int): name = self.names[name]
         if name not in self.data: self.names.append(name)
         self.data[name] = item
 
+    def get_at(self, index) -> list:
+        r""" returns a list of values at multiple positions given by a slice, a list (or ndarray) of indices or a boolean mask """
+        data, names = self.data, self.names
+        return [ data[names[i]] for i in _bulk_positions_(index, len(names)) ]
+
+    def update_at(self, index, values:Iterable) -> None:
+        r""" sets values at multiple (existing) positions, see :func:`~known.basic.IndexedDict.get_at` """
+        data, names = self.data, self.names
+        for i,v in zip(_bulk_positions_(index, len(names)), values, strict=True): data[names[i]] = v
+
     def __delitem__(self, name): 
+        name = _as_key_(name)
         index = None
         if isinstance(name, int):  
             index = name
@@ -563,6 +2569,290 @@ class IndexedDict(UserDict):
 
 #=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
 
+class SparseIndexedDict(UserDict):
+    r""" Same as :class:`~known.basic.IndexedDict` but with fast deletion and position lookup.
+
+    A key to slot map is maintained and deleted keys leave a tombstone in the list of slots. 
+    A Fenwick tree over the slots counts live keys so that mapping between slots and positions costs O(log n) while tombstones exist 
+    (and O(1) when there are none). Tombstones are removed (compacted) only when they exceed half of the slots, hence
+    deletes by key or by position cost amortized O(log n) in any order.
+
+    .. note:: iteration order is the order of insertion (same as :class:`~known.basic.IndexedDict`)
+    """
+
+    TOMB = object() # marks a deleted slot
+    MIN_COMPACT = 64 # minimum no of tombstones before compacting on delete
+
+    def __init__(self, **members) -> None:
+        self.slots, self.pos, self.ndead, self.tree = [], {}, 0, [0]
+        super().__init__(*[], **members)
+
+    def compact(self) -> None:
+        r""" removes tombstones """
+        if not self.ndead: return
+        self.slots = [k for k in self.slots if k is not __class__.TOMB]
+        self.pos = {k:i for i,k in enumerate(self.slots)}
+        self.ndead = 0
+        # rebuild fenwick tree (all slots are live) in O(n)
+        n = len(self.slots)
+        tree = [0] + [1]*n
+        for i in range(1, n+1):
+            j = i + (i & -i)
+            if j <= n: tree[j] += tree[i]
+        self.tree = tree
+
+    def _live_before_(self, slot:int) -> int:
+        # no of live keys in slots[:slot]
+        tree, res = self.tree, 0
+        while slot > 0:
+            res += tree[slot]
+            slot -= slot & -slot
+        return res
+
+    def _slot_of_(self, index:int) -> int:
+        # slot of the key at given position
+        n = len(self.data)
+        if index < 0: index += n
+        if not (0 <= index < n): raise IndexError(f'index out of range {index}')
+        if not self.ndead: return index
+        tree, slot, rem = self.tree, 0, index+1
+        step = 1 << (len(tree)-1).bit_length()
+        while step:
+            if slot + step < len(tree) and tree[slot+step] < rem:
+                slot += step
+                rem -= tree[slot]
+            step >>= 1
+        return slot
+
+    @property
+    def names(self) -> list: 
+        r""" list of keys in order (a new list if there are tombstones) """
+        return [k for k in self.slots if k is not __class__.TOMB] if self.ndead else self.slots
+
+    def index_of(self, name) -> int:
+        r""" returns the position of a key """
+        slot = self.pos[name]
+        return self._live_before_(slot) if self.ndead else slot
+
+    def keys(self): return enumerate(self.names, 0) # for i,k in self.keys()
+
+    def items(self): return enumerate(self.data.items(), 0) # for i,(k,v) in self.items()
+
+    def __len__(self): return len(self.data)
+
+    def __getitem__(self, name): 
+        name = _as_key_(name)
+        if isinstance(name, int): name = self.slots[self._slot_of_(name)]
+        elif _is_bulk_(name): return self.get_at(name)
+        if name in self.data: 
+            return self.data[name]
+        else:
+            raise KeyError(name)
+
+    def __setitem__(self, name, item): 
+        name = _as_key_(name)
+        if isinstance(name, int): name = self.slots[self._slot_of_(name)]
+        if name not in self.data: 
+            self.pos[name] = len(self.slots)
+            self.slots.append(name)
+            # append a fenwick node covering (i - lowbit(i), i]
+            i = len(self.tree)
+            self.tree.append(1 + self._live_before_(i-1) - self._live_before_(i - (i & -i)))
+        self.data[name] = item
+
+    def get_at(self, index) -> list:
+        r""" same as :func:`~known.basic.IndexedDict.get_at` """
+        data, slots = self.data, self.slots
+        return [ data[slots[self._slot_of_(i)]] for i in _bulk_positions_(index, len(data)) ]
+
+    def update_at(self, index, values:Iterable) -> None:
+        r""" same as :func:`~known.basic.IndexedDict.update_at` """
+        data, slots = self.data, self.slots
+        for i,v in zip(_bulk_positions_(index, len(data)), values, strict=True): data[slots[self._slot_of_(i)]] = v
+
+    def __delitem__(self, name): 
+        name = _as_key_(name)
+        if isinstance(name, int): name = self.slots[self._slot_of_(name)]
+        if name in self.data: 
+            slot = self.pos.pop(name)
+            self.slots[slot] = __class__.TOMB
+            self.ndead += 1
+            del self.data[name]
+            i, tree = slot+1, self.tree
+            while i < len(tree):
+                tree[i] -= 1
+                i += i & -i
+            if self.ndead > __class__.MIN_COMPACT and 2*self.ndead > len(self.slots): self.compact()
+
+    def __iter__(self): return (k for k in self.slots if k is not __class__.TOMB) if self.ndead else iter(self.slots)
+
+    def __contains__(self, name): return name in self.data
+
+    def __repr__(self) -> str:
+        return f'{__class__} :: {len(self)} Members'
+    
+    def __str__(self) -> str:
+        items = ''
+        for i,k in enumerate(self):
+            items += f'[{i}] \t {k} : {self[i]}\n'
+        return f'{__class__} :: {len(self)} Members\n{items}'
+    
+    def __copy__(self):
+        inst = self.__class__.__new__(self.__class__)
+        inst.__dict__.update(self.__dict__)
+        inst.__dict__["data"] = self.__dict__["data"].copy()
+        inst.__dict__["slots"] = self.__dict__["slots"].copy()
+        inst.__dict__["pos"] = self.__dict__["pos"].copy()
+        inst.__dict__["tree"] = self.__dict__["tree"].copy()
+        return inst
+
+#=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class ArrayIndexedDict(IndexedDict):
+    r""" An :class:`~known.basic.IndexedDict` for numeric values which are stored in a NumPy array (one row per key) 
+    so that bulk access is a single fancy-index operation.
+
+    :param dtype:   data type of values
+    :param shape:   shape of each value, default is scalar
+    
+    .. note:: ``self.data`` maps keys to rows, use :func:`~known.basic.ArrayIndexedDict.values_array` for a view of all values
+    """
+
+    def __init__(self, dtype='float64', shape:tuple=(), **members) -> None:
+        import numpy as np
+        self.array = np.zeros((16, *shape), dtype=dtype) # grows by doubling
+        super().__init__(**members)
+
+    def values_array(self): 
+        r""" view of values of all keys in order """
+        return self.array[:len(self.names)]
+
+    def items(self): return enumerate(((k, self.array[i]) for i,k in enumerate(self.names)), 0) # for i,(k,v) in self.items()
+
+    def __getitem__(self, name): 
+        name = _as_key_(name)
+        if isinstance(name, int): return self.values_array()[name]
+        elif _is_bulk_(name): return self.get_at(name)
+        if name in self.data: 
+            return self.array[self.data[name]]
+        else:
+            raise KeyError(name)
+
+    def __setitem__(self, name, item): 
+        name = _as_key_(name)
+        if isinstance(name, int): name = self.names[name]
+        if name not in self.data: 
+            n = len(self.names)
+            if n == len(self.array):
+                import numpy as np
+                self.array = np.concatenate((self.array, np.zeros_like(self.array)))
+            self.data[name] = n
+            self.names.append(name)
+        self.array[self.data[name]] = item
+
+    def __delitem__(self, name): 
+        name = _as_key_(name)
+        if isinstance(name, int): name = self.names[name]
+        if name in self.data: 
+            i, n = self.data.pop(name), len(self.names)
+            self.array[i:n-1] = self.array[i+1:n]
+            del self.names[i]
+            for j in range(i, n-1): self.data[self.names[j]] = j
+
+    def get_at(self, index):
+        r""" returns an ndarray of values at multiple positions given by a slice, a list (or ndarray) of indices or a boolean mask """
+        return self.values_array()[index if not isinstance(index, (list, range)) else _bulk_positions_(index, len(self.names))]
+
+    def update_at(self, index, values) -> None:
+        r""" sets values at multiple (existing) positions in a single assignment, ``values`` should be broadcastable """
+        self.values_array()[index if not isinstance(index, (list, range)) else _bulk_positions_(index, len(self.names))] = values
+
+    def __copy__(self):
+        inst = super().__copy__()
+        inst.__dict__["array"] = self.__dict__["array"].copy()
+        return inst
+
+#=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class CompactIndexedDict(MutableMapping):
+    r""" Same as :class:`~known.basic.IndexedDict` but uses ``__slots__`` and does not derive from ``UserDict``, 
+    instances have no ``__dict__`` hence use less memory - useful when holding a large number of small instances.
+
+    .. note:: methods like ``get``, ``pop``, ``update``, ``setdefault`` and ``values`` come from ``MutableMapping``
+    """
+    __slots__ = ('data', 'names')
+
+    def __init__(self, **members) -> None:
+        self.data, self.names = {}, []
+        for k,v in members.items(): self[k] = v
+
+    def keys(self): return enumerate(self.names, 0) # for i,k in self.keys()
+
+    def items(self): return enumerate(self.data.items(), 0) # for i,(k,v) in self.items()
+
+    def __len__(self): return len(self.data)
+
+    def __getitem__(self, name): 
+        name = _as_key_(name)
+        if isinstance(name, int): name = self.names[name]
+        elif _is_bulk_(name): return self.get_at(name)
+        if name in self.data: 
+            return self.data[name]
+        else:
+            raise KeyError(name)
+
+    def __setitem__(self, name, item): 
+        name = _as_key_(name)
+        if isinstance(name, int): name = self.names[name]
+        if name not in self.data: self.names.append(name)
+        self.data[name] = item
+
+    def __delitem__(self, name): 
+        name = _as_key_(name)
+        index = None
+        if isinstance(name, int):  
+            index = name
+            name = self.names[name]
+        if name in self.data: 
+            del self.names[self.names.index(name) if index is None else index]
+            del self.data[name]
+
+    def get_at(self, index) -> list:
+        r""" same as :func:`~known.basic.IndexedDict.get_at` """
+        data, names = self.data, self.names
+        return [ data[names[i]] for i in _bulk_positions_(index, len(names)) ]
+
+    def update_at(self, index, values:Iterable) -> None:
+        r""" same as :func:`~known.basic.IndexedDict.update_at` """
+        data, names = self.data, self.names
+        for i,v in zip(_bulk_positions_(index, len(names)), values, strict=True): data[names[i]] = v
+
+    def __iter__(self): return iter(self.names)
+
+    def __contains__(self, name): return name in self.data
+
+    def __repr__(self) -> str:
+        return f'{__class__} :: {len(self)} Members'
+    
+    def __str__(self) -> str:
+        items = ''
+        for i,k in enumerate(self):
+            items += f'[{i}] \t {k} : {self[i]}\n'
+        return f'{__class__} :: {len(self)} Members\n{items}'
+
+    def __copy__(self):
+        inst = self.__class__.__new__(self.__class__)
+        inst.data, inst.names = self.data.copy(), self.names.copy()
+        return inst
+
+    def copy(self): return self.__copy__()
+
+    def __getstate__(self): return (self.data, self.names)
+
+    def __setstate__(self, state): self.data, self.names = state
+
+#=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
 class Zipper:
     r""" zip API using ZipFile package """
 
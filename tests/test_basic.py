@@ -0,0 +1,541 @@
+import os
+import pytest
+from known.basic import KioLog
+
+
+def test_kiolog_reload_across_compaction(tmp_path):
+    path = os.path.join(tmp_path, 'log.pkl')
+    with KioLog(path, min_log=200, background=False) as d:
+        for i in range(50): d[f'k{i}'] = i
+        for i in range(0, 50, 7): del d[f'k{i}']
+    expected = { f'k{i}':i for i in range(50) if i%7 }
+    with KioLog(path, min_log=200, background=False) as d: assert dict(d.data) == expected
+    with KioLog(path, min_log=200, background=True) as d:
+        for i in range(50, 100): d[f'k{i}'] = i
+        expected.update({ f'k{i}':i for i in range(50, 100) })
+        for i in range(1, 100, 5): 
+            if f'k{i}' in d: del d[f'k{i}']
+            expected.pop(f'k{i}', None)
+    with KioLog(path, min_log=200) as d: assert dict(d.data) == expected
+
+
+def test_kiolog_reload_compressed_snapshot(tmp_path):
+    path = os.path.join(tmp_path, 'state.pkl.gz')
+    with KioLog(path, background=False, min_log=10) as d:
+        for i in range(20): d[i] = i
+    with KioLog(path) as d: assert dict(d.data) == { i:i for i in range(20) }
+
+
+def test_kiolog_journals_ior_and_copy_is_detached(tmp_path):
+    import copy
+    path = os.path.join(tmp_path, 'log.pkl')
+    with KioLog(path) as d:
+        d['a'] = 1
+        d |= {'b': 2}
+        d.update(c=3)
+        c = d.copy()
+        c['zz'] = 0
+        assert isinstance(copy.copy(d), dict) and (d | {'e': 5})['e'] == 5
+    with KioLog(path) as d: assert dict(d.data) == dict(a=1, b=2, c=3)
+
+
+def test_sparse_indexed_dict_matches_indexed_dict():
+    import random
+    from known.basic import SparseIndexedDict, IndexedDict
+    rng = random.Random(0)
+    s, r = SparseIndexedDict(), IndexedDict()
+    for step in range(5000):
+        op = rng.random()
+        if op < .45:
+            k = f'k{rng.randrange(1000)}'
+            s[k] = r[k] = step
+        elif op < .75 and len(r):
+            if rng.random() < .5: i = rng.randrange(-len(r), len(r))
+            else: i = r.names[rng.randrange(len(r))]
+            del s[i]
+            del r[i]
+        elif len(r):
+            i = rng.randrange(len(r))
+            assert s.index_of(r.names[i]) == i and s[i] == r[i]
+    assert list(s) == r.names and len(s) == len(r)
+
+
+def test_indexed_dicts_accept_numpy_scalars():
+    np = pytest.importorskip('numpy')
+    from known.basic import IndexedDict, SparseIndexedDict, CompactIndexedDict, ArrayIndexedDict
+    keys = np.array(['a', 'b', 'c'])
+    for C in (IndexedDict, SparseIndexedDict, CompactIndexedDict, ArrayIndexedDict):
+        d = C(a=1, b=2, c=3)
+        assert d[keys[0]] == 1 and d[np.int64(1)] == 2
+        assert list(d[np.array([0, 2])]) == [1, 3]
+        del d[np.int64(0)]
+        del d[keys[2]]
+        assert len(d) == 1 and d[0] == 2
+
+
+def _old_int2base(num, base, digs):
+    # per-digit reference implementation (from the original BaseConvert.int2base) with an explicit digit count
+    digits = [0 for _ in range(digs)]
+    for d in range(digs):
+        digits[d] = num%base
+        num = num//base
+    return digits
+
+def _old_base2int(num, base):
+    res = 0
+    for i,n in enumerate(num): res += (base**i)*n
+    return int(res)
+
+def _exact_digits(num, base):
+    d = 1
+    while num >= base**d: d += 1
+    return d
+
+
+def test_base_convert_matches_reference():
+    import random
+    from known.basic import BaseConvert
+    rng = random.Random(0)
+    nums = [0, 1, 2, 7, 8, 9, 10, 15, 16, 255, 256, 999, 1000, 10**6, 2**64-1, 2**64]
+    nums += [ rng.getrandbits(rng.choice((8, 64, 500, 3000))) for _ in range(30) ]
+    for base in (2, 3, 10, 16, 36, 255, 256, 1000):
+        nums_b = nums + [ base**k for k in (1, 2, 50, 600) ] + [ base**k - 1 for k in (1, 2, 50, 600) ]
+        for num in nums_b:
+            digs = _exact_digits(num, base)
+            expected = _old_int2base(num, base, digs)
+            assert BaseConvert.ndigits_exact(num, base) == digs
+            assert BaseConvert.int2base(num, base, None) == expected
+            assert BaseConvert.int2base(num, base, digs+3) == _old_int2base(num, base, digs+3)
+            assert BaseConvert.base2int(expected, base) == _old_base2int(expected, base) == num
+    for num in nums:
+        assert BaseConvert.int2hex(num) == f'{num:X}'
+        assert BaseConvert.from_base_10(BaseConvert.SYM_BIN, num) == f'{num:b}'
+        assert BaseConvert.to_base_10(BaseConvert.SYM_HEX, f'{num:X}') == num
+    assert BaseConvert.convert([1, 0, 0, 0], 2, 10) == (8,)
+
+
+def test_base_convert_accepts_numpy_integers():
+    np = pytest.importorskip('numpy')
+    from known.basic import BaseConvert
+    assert list(BaseConvert.int2base(np.int64(255), 16, None)) == [15, 15]
+    assert BaseConvert.from_base_10(BaseConvert.SYM_HEX, np.int64(255)) == 'FF'
+    assert BaseConvert.int2hex(np.int64(4096)) == '1000'
+
+
+def test_kiostore_recovers_torn_tail(tmp_path):
+    from known.basic import KioStore
+    folder = os.path.join(tmp_path, 'store')
+    s = KioStore(folder, shards=1)
+    s['a'] = 1
+    s.flush()
+    s['b'] = list(range(100))
+    s['c'] = 3
+    for f in s.files: f.flush()
+    size = s.sizes()[0]
+    with open(s.shard_path(0), 'r+b') as f: f.truncate(size - 3) # crash in the middle of appending 'c'
+    s = KioStore(folder)
+    assert s['a'] == 1 and s['b'] == list(range(100)) and 'c' not in s
+    s['d'] = 4
+    s.close()
+    s = KioStore(folder)
+    assert sorted(s.keys()) == ['a', 'b', 'd'] and s['d'] == 4
+    s.close()
+
+
+def test_remap_empty_range_raises_on_use():
+    from known.basic import Remap
+    r = Remap((5, 5), (0, 1))
+    assert r.backward(0.3) == 5.0
+    with pytest.raises(ZeroDivisionError): r.forward(5)
+    r.set_input_range((0, 10))
+    assert r.forward(5) == 0.5 and r.backward(0.5) == 5.0
+
+
+def test_kiocolumns_keeps_large_ints_with_none(tmp_path):
+    pytest.importorskip('numpy')
+    from known.basic import KioColumns
+    records = [ dict(a=2**60+1, b=1, c=2**60+1), dict(a=None, b=None, c=0.5), dict(a=-2**60-3, b=2, c=None) ]
+    cols = KioColumns.from_records(records)
+    path = os.path.join(tmp_path, 'cols')
+    cols.save(path)
+    cols = KioColumns.load(path)
+    assert cols.kind('a') == 'json' and cols.kind('b') == 'float'
+    rows = cols.to_records()
+    assert [ (r['a'], r['c']) for r in rows ] == [ (r['a'], r['c']) for r in records ]
+    assert rows[0]['b'] == 1 and rows[1]['b'] != rows[1]['b'] # None is stored as nan in float fields
+
+
+def test_kiocolumns_numpy_scalars(tmp_path):
+    np = pytest.importorskip('numpy')
+    from known.basic import KioColumns
+    records = [ dict(i=np.int64(3), f=np.float64(1.5), s=np.str_('x'), b=np.bool_(True), m=[np.int32(1), 'y'], g=np.float32(0.25)),
+                dict(i=np.int32(-4), f=2.5, s='y', b=False, m=None, g=np.int8(2)) ]
+    cols = KioColumns.from_records(records)
+    assert { n:cols.kind(n) for n in 'ifsbmg' } == dict(i='int', f='float', s='str', b='bool', m='json', g='float')
+    path = os.path.join(tmp_path, 'cols')
+    cols.save(path)
+    rows = KioColumns.load(path).to_records()
+    assert rows == [ dict(i=3, f=1.5, s='x', b=True, m=[1, 'y'], g=0.25), dict(i=-4, f=2.5, s='y', b=False, m=None, g=2.0) ]
+
+
+def test_kiostore_compact_is_atomic(tmp_path):
+    from unittest import mock
+    from known.basic import Kio, KioStore
+    folder = os.path.join(tmp_path, 'store')
+    s = KioStore(folder, shards=2)
+    for i in range(20): s[f'k{i}'] = i
+    for i in range(0, 20, 2): s[f'k{i}'] = -i
+    del s['k1']
+    s.flush()
+    expected = { k:s[k] for k in s.keys() }
+    with mock.patch.object(Kio, 'save_file_atomic', side_effect=OSError('crash')):
+        with pytest.raises(OSError): s.compact()
+    s2 = KioStore(folder)
+    assert { k:s2[k] for k in s2.keys() } == expected
+    assert s2.compact() > 0
+    s2['new'] = 1
+    s2.close()
+    s3 = KioStore(folder)
+    assert { k:s3[k] for k in s3.keys() } == {**expected, 'new':1}
+    assert sorted(os.listdir(folder)) == sorted(['index.pkl'] + [ os.path.basename(s3.shard_path(i)) for i in range(2) ])
+    s3.close()
+
+
+def test_verbose_metrics():
+    import json
+    from known.basic import Verbose
+    Verbose.reset_metrics()
+    @Verbose.timed('f')
+    def f(x): return x+1
+    try:
+        for i in range(10):
+            with Verbose.timer('block') as t: Verbose.count('n', 2)
+            assert t.elapsed >= 0
+            Verbose.observe('h', i)
+            assert f(i) == i+1
+        m = Verbose.metrics(percentiles=(50, 100))
+        assert m['counters'] == {'n': 20} and m['histograms']['f']['count'] == 10 and m['histograms']['block']['count'] == 10
+        assert m['histograms']['h'] == dict(count=10, total=45, min=0, max=9, mean=4.5, p50=4, p100=9)
+        assert json.loads(Verbose.metrics(as_json=True))['counters'] == {'n': 20}
+        Verbose.disable()
+        with Verbose.timer('block') as t: Verbose.count('n')
+        assert t.elapsed == 0 and f(1) == 2
+        assert Verbose.metrics()['counters'] == {'n': 20} and Verbose.metrics()['histograms']['f']['count'] == 10
+    finally:
+        Verbose.enable()
+        Verbose.reset_metrics()
+
+
+def test_verbose_sizeof_sampling_is_unbiased():
+    from known.basic import Verbose
+    for make in (lambda n: { i:'x'*i for i in range(n) }, lambda n: [ 'x'*i for i in range(n) ]):
+        x = make(1500)
+        full, sampled = Verbose.sizeof(x)['total'], Verbose.sizeof(x, sample=1000)
+        assert sampled['sampled'] and abs(sampled['total'] - full) < 0.01 * full
+    shared = [ 'y'*1000 ] * 10
+    assert Verbose.sizeof(shared)['total'] < 2000 + Verbose.sizeof([None]*10)['total']
+
+
+def _old_forward(X, i, o): return ((X - i[0])*(o[1]-o[0])/(i[1]-i[0])) + o[0]
+
+
+def test_remap_matches_old_formula():
+    import random
+    from known.basic import Remap
+    rng = random.Random(0)
+    for _ in range(2000):
+        i = sorted((rng.uniform(-1e3, 1e3), rng.uniform(-1e3, 1e3)))
+        o = sorted((rng.uniform(-10, 10), rng.uniform(-10, 10)))
+        r = Remap(i, o)
+        for X in (i[0], i[1], rng.randint(-1000, 1000), rng.uniform(*i)):
+            assert r.forward(X) == _old_forward(X, i, o)
+            assert r.backward(X) == _old_forward(X, o, i)
+    np = pytest.importorskip('numpy')
+    r = Remap((0, 255), (-1., 1.))
+    X = np.arange(256, dtype=np.uint8)
+    expected = _old_forward(X.astype(np.float64), (0, 255), (-1., 1.))
+    assert (r.forward(X) == expected).all() and r.forward(X)[[0, -1]].tolist() == [-1., 1.]
+    Y = np.empty(256)
+    assert (r.forward(X, out=Y) == expected).all()
+    Z = X.astype(np.float64)
+    assert (r.forward(Z, inplace=True) == expected).all() and (Z == expected).all()
+    r = Remap(([0., 10.], [2., 30.]), (0., 1.), axis=0)
+    X = np.array([[0., 1., 2.], [10., 20., 30.]])
+    assert r.forward(X).tolist() == [[0., .5, 1.], [0., .5, 1.]]
+
+
+def test_base_convert_arrays_match_scalar():
+    np = pytest.importorskip('numpy')
+    from known.basic import BaseConvert
+    nums = np.array([0, 1, 15, 16, 255, 4095, 65535])
+    for syms, joiner in ((BaseConvert.SYM_HEX, ''), (BaseConvert.SYM_HEX, '.'), (BaseConvert.n_syms(16), ':'), (BaseConvert.n_syms(100), '-')):
+        strs = BaseConvert.from_base_10_array(syms, nums, 4, joiner)
+        assert strs.tolist() == [ BaseConvert.from_base_10(syms, int(n), joiner, 4) for n in nums ]
+    assert BaseConvert.from_base_10_array(BaseConvert.n_syms(16), [255], 2, ' ').tolist() == ['15 15']
+    assert BaseConvert.to_base_10_array(BaseConvert.SYM_HEX, BaseConvert.from_base_10_array(BaseConvert.SYM_HEX, nums, 4)).tolist() == nums.tolist()
+
+
+def test_uidgen_unique_across_instances_threads_and_forks():
+    import threading
+    from known.basic import UidGen, Verbose
+    a, b = UidGen(), UidGen()
+    ids = a.batch(1000) + b.batch(1000) + [ a() for _ in range(100) ] + [ b() for _ in range(100) ]
+    out = []
+    def work(): out.extend(a() for _ in range(1000))
+    threads = [ threading.Thread(target=work) for _ in range(4) ]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    ids += out
+    if hasattr(os, 'fork'):
+        r, w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.write(w, '\n'.join(a.batch(100)).encode())
+            os._exit(0)
+        os.waitpid(pid, 0)
+        os.close(w)
+        with os.fdopen(r) as f: ids += f.read().split('\n')
+    assert len(ids) == len(set(ids))
+    g = UidGen(['%Y', '%f', '%S'], start='<', sep='_', end='>', tag='.')
+    u = g()
+    assert u.startswith('<') and u.endswith('>') and u.count('.') == 2 and len(u.split('.')[0].split('_')) == 3
+    assert Verbose.now(unique=True) != Verbose.now(unique=True)
+    assert len(Verbose.now()) == len('YYYYmmddHHMMSSffffff')
+
+
+def test_kio_npy_modes(tmp_path):
+    np = pytest.importorskip('numpy')
+    from known.basic import Kio
+    a = np.arange(12.).reshape(3, 4)
+    path = Kio.save_file(a, os.path.join(tmp_path, 'a.npy'), 'npy')
+    assert (Kio.load_file(path, 'npy') == a).all()
+    m = Kio.load_file(path, 'mmap')
+    assert isinstance(m, np.memmap) and (m[1:] == a[1:]).all()
+    with pytest.raises(AssertionError): Kio.save_file(a, os.path.join(tmp_path, 'a.npy.gz'), 'npy')
+    with pytest.raises(AssertionError): Kio.save_file(a, path, 'npy', codec='gzip')
+    assert not os.path.exists(os.path.join(tmp_path, 'a.npy.gz'))
+
+
+def test_kiocache_invalidation_and_counters(tmp_path):
+    import time
+    from known.basic import Kio, KioCache
+    paths = [ Kio.save_file(dict(i=i), os.path.join(tmp_path, f'{i}.json'), 'json') for i in range(3) ]
+    cache = KioCache(max_entries=2)
+    o = cache.load_file(paths[0], 'json')
+    assert cache.load_file(paths[0], 'json') is o and o == dict(i=0)
+    assert cache.stats() == dict(hits=1, misses=1, evictions=0, entries=1, nbytes=os.path.getsize(paths[0]))
+    assert cache.load_file(paths[0], 'json', copy=True) == o and cache.load_file(paths[0], 'json', copy=True) is not o
+    time.sleep(0.01)
+    Kio.save_file(dict(i=0, changed=True), paths[0], 'json') # changed file is reloaded
+    assert cache.load_file(paths[0], 'json') == dict(i=0, changed=True)
+    cache.load_file(paths[1], 'json')
+    cache.load_file(paths[2], 'json') # evicts paths[0]
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['entries']) == (3, 4, 1, 2)
+    assert cache.invalidate(paths[1]) == 1 and cache.invalidate(paths[0]) == 0 and len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0 and cache.stats()['nbytes'] == 0
+
+
+def test_kiosaver_coalesces_and_flushes(tmp_path):
+    import threading
+    from unittest import mock
+    from known.basic import Kio, KioSaver
+    gate, started = threading.Event(), threading.Event()
+    save = Kio.save_file_atomic
+    def slow_save(*args, **kwargs):
+        started.set()
+        gate.wait(5)
+        return save(*args, **kwargs)
+    a, b = os.path.join(tmp_path, 'a.json'), os.path.join(tmp_path, 'b.json')
+    with mock.patch.object(Kio, 'save_file_atomic', side_effect=slow_save):
+        saver = KioSaver(workers=1)
+        saver.save_file(dict(v=0), a, 'json')
+        assert started.wait(5)
+        for v in range(1, 4): saver.save_file(dict(v=v), a, 'json') # v=1 waits, v=2 and v=3 replace it
+        saver.save_file([1, 2], b, 'json')
+        gate.set()
+        assert saver.flush(timeout=10) == []
+    assert (saver.saved, saver.coalesced) == (3, 2)
+    assert Kio.load_file(a, 'json') == dict(v=3) and Kio.load_file(b, 'json') == [1, 2]
+    saver.save_file(object(), os.path.join(tmp_path, 'c.json'), 'json') # not json serializable
+    errors = saver.close()
+    assert len(errors) == 1 and errors[0][0].endswith('c.json') and isinstance(errors[0][1], TypeError)
+    assert not os.path.exists(os.path.join(tmp_path, 'c.json'))
+
+
+@pytest.mark.parametrize('name', ['r.jsonl', 'r.jsonl.gz', 'r.jsonl.zz'])
+def test_iter_jsonl_skip_limit_batch(tmp_path, name):
+    from known.basic import Kio, JsonlWriter
+    path = os.path.join(tmp_path, name)
+    records = [ dict(i=i, s='x'*i) for i in range(10) ]
+    Kio.save_file(records[:4], path, 'jsonl')
+    assert Kio.load_file(path, 'jsonl') == records[:4]
+    with JsonlWriter(path) as w: w.write_many(records[4:])
+    assert list(Kio.iter_jsonl(path)) == records
+    assert list(Kio.iter_jsonl(path, skip=3, limit=4)) == records[3:7]
+    assert list(Kio.iter_jsonl(path, skip=8, limit=5)) == records[8:]
+    assert list(Kio.iter_jsonl(path, batch=4)) == [ records[:4], records[4:8], records[8:] ]
+    assert list(Kio.iter_jsonl(path, skip=1, limit=6, batch=3)) == [ records[1:4], records[4:7] ]
+    assert list(Kio.iter_jsonl(path, limit=0)) == []
+
+
+def _shm_sum(descriptor, write=False):
+    from known.basic import Kio
+    with Kio.load_shm(descriptor) as shm: 
+        o = shm.object
+        res = (float(o['a'].sum()), o['tag'])
+        if write: o['a'][0] = -1 # visible to the owner
+        del o
+    return res
+
+
+def test_kioshm_round_trip():
+    np = pytest.importorskip('numpy')
+    import gc, multiprocessing
+    from known.basic import Kio
+    obj = dict(a=np.arange(10**5, dtype=np.float64), b=np.ones((3, 4), dtype=np.int8), tag='x')
+    with Kio.save_shm(obj, min_size=64) as owner:
+        assert len(owner.descriptor[2]) == 1 # only the large array is out-of-band
+        shm = Kio.load_shm(owner.descriptor)
+        a = shm.object['a']
+        assert (a == obj['a']).all() and (shm.object['b'] == obj['b']).all() and shm.object['tag'] == 'x'
+        assert not shm.close() # a view is still alive
+        del a
+        gc.collect()
+        assert shm.close()
+        if 'fork' in multiprocessing.get_all_start_methods():
+            with multiprocessing.get_context('fork').Pool(2) as pool: 
+                assert pool.map(_shm_sum, [owner.descriptor]*2) == [(float(obj['a'].sum()), 'x')]*2
+                pool.apply(_shm_sum, (owner.descriptor, True))
+            with Kio.load_shm(owner.descriptor) as shm: assert shm.object['a'][0] == -1
+
+
+def test_basecodec_round_trips():
+    import io, random
+    from known.basic import BaseConvert, BaseCodec
+    rng = random.Random(0)
+    alphabet = ''.join(map(chr, range(ord('0'), ord('0')+64)))
+    codecs = [
+        BaseCodec(BaseConvert.SYM_HEX),                               # power of 2, byte lookup
+        BaseCodec({ s:i for i,s in enumerate(alphabet[:32]) }),      # power of 2, 5 bit groups
+        BaseCodec({ s:i for i,s in enumerate(alphabet) }),           # power of 2, 6 bit groups
+        BaseCodec(BaseConvert.SYM_DEC, block=7),                      # other base
+        BaseCodec(BaseConvert.n_syms(100), block=5, joiner='.'),      # multi-char symbols
+        BaseCodec(BaseConvert.SYM_HEX, joiner=':'),                   # joiner with single-char symbols
+    ]
+    datas = [b'', b'\x00', b'\x00\x00\x01', b'\xff'*33, bytes(range(256))] + [ rng.randbytes(rng.randrange(1, 200)) for _ in range(20) ]
+    for codec in codecs:
+        for data in datas:
+            text = codec.encode(data)
+            assert codec.decode(text) == data
+            for blocks in (1, 3):
+                chunks = list(codec.iter_encode(io.BytesIO(data), blocks=blocks))
+                assert ''.join(chunks) == text
+                assert b''.join(codec.iter_decode(io.StringIO(text), blocks=blocks)) == data
+        assert codec.encode(b'\x00\x00') != codec.encode(b'\x00') # leading zeros are kept
+    assert codecs[0].encode(bytes(range(256))) == bytes(range(256)).hex().upper()
+    assert codecs[5].encode(b'\x01\xab') == '0:1:A:B'
+    with pytest.raises(ValueError): codecs[0].decode('ABC')
+
+
+def test_ravel_unravel_match_numpy():
+    np = pytest.importorskip('numpy')
+    from known.basic import BaseConvert
+    rng = np.random.default_rng(0)
+    for radices in ((3,), (2, 3, 4), (7, 1, 5, 16), (10, 10, 10, 10)):
+        size = int(np.prod(radices))
+        digits = tuple( rng.integers(0, r, 100) for r in radices )
+        for order in ('C', 'F'):
+            nums = BaseConvert.ravel(digits, radices, order)
+            assert (nums == np.ravel_multi_index(digits, radices, order=order)).all()
+            back = BaseConvert.unravel(nums, radices, order)
+            assert all( (b == d).all() for b,d in zip(back, digits) )
+            assert all( (b == e).all() for b,e in zip(back, np.unravel_index(nums, radices, order=order)) )
+            assert BaseConvert.unravel(size-1, radices, order) == tuple(r-1 for r in radices)
+        assert BaseConvert.check_digits(digits, radices) and not BaseConvert.check_digits([r for r in radices], radices)
+    big = (2**40, 3**30, 10**20) # beyond int64, python ints
+    d = (2**40-1, 5, 10**19)
+    assert BaseConvert.unravel(BaseConvert.ravel(d, big), big) == d
+    tables = (BaseConvert.SYM_HEX, BaseConvert.SYM_BIN)
+    assert BaseConvert.unravel_syms(BaseConvert.ravel_syms(('F', '1'), tables), tables) == ('F', '1')
+    syms = (np.array(['A', '3', '0']), np.array(['1', '0', '1']))
+    back = BaseConvert.unravel_syms(BaseConvert.ravel_syms(syms, tables), tables)
+    assert all( (b == s).all() for b,s in zip(back, syms) )
+
+
+def test_remap_lut_matches_forward():
+    np = pytest.importorskip('numpy')
+    from known.basic import Remap
+    rng = np.random.default_rng(0)
+    r = Remap((0, 255), (-1., 1.))
+    X = rng.integers(0, 256, (32, 32), dtype=np.uint8)
+    assert (r.forward_lut(X) == r.forward(X).astype(np.float32)).all()
+    out = np.empty(X.shape, dtype=np.float32)
+    assert r.forward_lut(X, out=out) is out and (out == r.forward(X).astype(np.float32)).all()
+    assert r.lut() is r.lut() # cached
+    r2 = Remap((-128, 127), (0, 1000))
+    X8 = rng.integers(-128, 128, 1000, dtype=np.int8)
+    Y = r2.forward_lut(X8, dtype_out='int16')
+    assert Y.dtype == np.int16 and (Y == np.round(r2.forward(X8)).astype(np.int16)).all()
+    Y = r2.forward_lut(X8, dtype_out='uint8') # clipped to 255
+    assert Y.max() == 255 and (Y == np.clip(np.round(r2.forward(X8)), 0, 255)).all()
+    Y = r2.forward_lut(X8, dtype_out='int16', rounding='floor')
+    assert (Y == np.floor(r2.forward(X8))).all()
+    X16 = rng.integers(0, 1000, 1000, dtype=np.uint16)
+    assert (r2.backward_lut(X16, dtype_out='float64') == r2.backward(X16)).all()
+    table = r2.lut('int8', 'float32')
+    r2.set_input_range((0, 1))
+    assert r2.lut('int8', 'float32') is not table # ranges changed
+    with pytest.raises(AssertionError): Remap(([0, 0], [1, 2]), (0, 1)).lut()
+    with pytest.raises(AssertionError): r.lut('float32')
+
+
+def test_remap_per_channel_and_fit_stream():
+    np = pytest.importorskip('numpy')
+    from known.basic import Remap
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(1000, 3)) * np.array([1., 10., 100.]) + np.array([0., 5., -50.])
+    r = Remap.fit_stream((data[i:i+100] for i in range(0, 1000, 100)), axis=1)
+    assert np.allclose(r.input_low, data.min(axis=0)) and np.allclose(r.input_high, data.max(axis=0))
+    Y = r.forward(data)
+    assert np.allclose(Y.min(axis=0), 0) and np.allclose(Y.max(axis=0), 1)
+    assert np.allclose(r.backward(Y), data)
+    img = rng.integers(0, 256, (3, 8, 8)).astype(np.float64) # channels first
+    rc = Remap(([0., 0., 0.], [255., 255., 128.]), (0., 1.), axis=0)
+    Z = rc.forward(img)
+    assert np.allclose(Z[2], img[2]/128.) and np.allclose(Z[0], img[0]/255.)
+    out = np.empty_like(img)
+    assert rc.forward(img, out=out) is out and np.allclose(out, Z)
+    g = Remap.fit_stream([data[:10], data[10:]])
+    assert np.ndim(g.input_low) == 0 and g.input_low == data.min() and g.input_high == data.max()
+    try: import torch
+    except ImportError: return
+    T = torch.tensor(img)
+    assert np.allclose(rc.forward(T).numpy(), Z)
+
+
+def test_verbose_render_truncation():
+    np = pytest.importorskip('numpy')
+    import io, contextlib
+    from known.basic import Verbose
+    def rendered(*args, **kwargs):
+        s = io.StringIO()
+        Verbose.render(*args, stream=s, **kwargs)
+        return s.getvalue()
+    a = np.arange(24).reshape(2, 3, 4)
+    full = rendered(a, threshold=None)
+    f = io.StringIO()
+    with contextlib.redirect_stdout(f): Verbose.recP(a)
+    assert f.getvalue() == full and full.count('\n') == 2 + 2*(2 + 3*(2 + 4)) and '[ @123\t 23 ]' in full
+    big = np.arange(2000)
+    f = io.StringIO()
+    with contextlib.redirect_stdout(f): Verbose.recP(big)
+    assert f.getvalue() == rendered(big, threshold=None) and f.getvalue().count('\n') == 2002 # recP does not summarize by default
+    summary = rendered(big) # render summarizes beyond 1000 elements
+    assert summary.splitlines() == ['[ @ #2000', '\t[ @0\t 0 ]', '\t[ @1\t 1 ]', '\t[ @2\t 2 ]', '\t...', '\t[ @1997\t 1997 ]', '\t[ @1998\t 1998 ]', '\t[ @1999\t 1999 ]', ']']
+    assert rendered(a, max_depth=1).splitlines() == ['[ @ #2', '\t[ @0 #3 ... ]', '\t[ @1 #3 ... ]', ']']
+    cut = rendered(big, threshold=None, max_chars=50)
+    assert cut == rendered(big, threshold=None)[:50] + '\n... (truncated)\n'
+    assert Verbose.strA_(range(10), edgeitems=2) == '0|1|...|8|9|' and Verbose.strA_([1, 2], edgeitems=2) == '1|2|'
+    assert '0:\n0\n...\n9:\n9\n' in Verbose.strD_({ i:i for i in range(10) }, edgeitems=1)